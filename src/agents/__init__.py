@@ -1,6 +1,7 @@
 """Specialized agents for the AI Co-Scientist system."""
 
 from .base_agent import BaseAgent
+from .context_store import ContextStore, InMemoryStore, RedisStore
 from .supervisor_agent import SupervisorAgent
 from .generation_agent import GenerationAgent
 from .reflection_agent import ReflectionAgent
@@ -11,6 +12,9 @@ from .meta_review_agent import MetaReviewAgent
 
 __all__ = [
     "BaseAgent",
+    "ContextStore",
+    "InMemoryStore",
+    "RedisStore",
     "SupervisorAgent",
     "GenerationAgent",
     "ReflectionAgent",
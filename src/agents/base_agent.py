@@ -1,7 +1,362 @@
 """Base agent class for the AI Co-Scientist system."""
 
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import uuid
+import zlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - optional dependency
+    faiss = None
+
+from .context_store import ContextStore, InMemoryStore
+
+# Dimension of the placeholder embeddings used when no embedding endpoint is configured
+PLACEHOLDER_EMBEDDING_DIM = 256
+
+class _UUIDPool:
+    """Generator of random UUIDs drawing entropy from a pre-fetched buffer."""
+    
+    def __init__(self, size: int = 4096):
+        """Initialize the pool.
+        
+        Args:
+            size: Number of UUIDs to fetch entropy for per refill
+        """
+        self.size = size
+        self._buffer = b""
+        self._offset = 0
+    
+    def next(self) -> str:
+        """Get a new random (version 4) UUID string."""
+        if self._offset >= len(self._buffer):
+            self._buffer = os.urandom(16 * self.size)
+            self._offset = 0
+        raw = self._buffer[self._offset:self._offset + 16]
+        self._offset += 16
+        return str(uuid.UUID(bytes=raw, version=4))
+
+_UUID_POOL = _UUIDPool()
+
+def new_id() -> str:
+    """Generate a unique ID for a hypothesis or other record.
+    
+    Returns:
+        Random UUID string
+    """
+    return _UUID_POOL.next()
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a matrix, leaving zero rows untouched."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _hash_embeddings(texts: List[str], dim: int = PLACEHOLDER_EMBEDDING_DIM) -> np.ndarray:
+    """Embed texts as hashed bag-of-words vectors.
+    
+    Args:
+        texts: Texts to embed
+        dim: Embedding dimension
+        
+    Returns:
+        L2-normalized embeddings of shape (len(texts), dim)
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for token in re.findall(r"\w+", text.lower()):
+            vectors[i, zlib.crc32(token.encode()) % dim] += 1.0
+    return _normalize(vectors)
+
+def _similar_pairs(embeddings: np.ndarray, k: int) -> List[Tuple[int, int]]:
+    """Find the most similar pairs of rows with one matrix product.
+    
+    Args:
+        embeddings: L2-normalized embeddings of shape (N, D)
+        k: Number of pairs to return
+        
+    Returns:
+        Up to k (i, j) row pairs with i < j, most similar first
+    """
+    n = len(embeddings)
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+    
+    # NumPy has no half-precision GEMM, so compact embeddings are widened first
+    embeddings = embeddings.astype(np.float32, copy=False)
+    sims = embeddings @ embeddings.T
+    # Keep each unordered pair once and drop self-similarity
+    sims[np.tril_indices(n)] = -np.inf
+    top = np.argpartition(-sims, k - 1, axis=None)[:k]
+    top = top[np.argsort(-sims.ravel()[top])]
+    rows, cols = np.unravel_index(top, sims.shape)
+    return list(zip(rows.tolist(), cols.tolist()))
+
+def _append_rows(matrix: Optional[np.ndarray], rows: np.ndarray) -> np.ndarray:
+    """Append rows to a matrix stored as a view of a geometrically grown buffer.
+    
+    The returned matrix is a view of the first rows of its buffer, and the
+    rest of the buffer is spare capacity, so repeated appends are amortized
+    O(1) per row. Views returned earlier are shorter and never see the
+    rows written after them.
+    
+    Args:
+        matrix: Matrix returned by a previous call, or None
+        rows: Rows to append
+        
+    Returns:
+        Matrix with the rows appended
+    """
+    n = 0 if matrix is None else len(matrix)
+    buffer = None if matrix is None else matrix.base
+    reusable = (
+        buffer is not None
+        and buffer.ndim == 2
+        and buffer.dtype == rows.dtype
+        and buffer.shape[1] == rows.shape[1]
+        and buffer.shape[0] >= n + len(rows)
+        and np.shares_memory(buffer[:1], matrix[:1])
+    )
+    if not reusable:
+        buffer = np.empty((max(16, 2 * (n + len(rows))), rows.shape[1]), dtype=rows.dtype)
+        if n:
+            buffer[:n] = matrix
+    buffer[n:n + len(rows)] = rows
+    return buffer[:n + len(rows)]
+
+class _ResponseCache:
+    """Bounded LRU cache of model responses keyed by request hash."""
+    
+    def __init__(self, maxsize: int = 1024):
+        """Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of responses to keep
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        # Created lazily, and again for each new event loop, so the lock is
+        # never used on a loop other than the one it is bound to
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+    
+    async def get(self, key: bytes) -> Optional[str]:
+        """Get a cached response, marking it as recently used.
+        
+        Args:
+            key: Request hash
+            
+        Returns:
+            Cached response or None
+        """
+        async with self._get_lock():
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+    
+    async def set(self, key: bytes, response: str) -> None:
+        """Store a response, evicting the least recently used entry if full.
+        
+        Args:
+            key: Request hash
+            response: Model response
+        """
+        async with self._get_lock():
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+class _RateLimiter:
+    """Token bucket limiting model usage to a number of tokens per minute."""
+    
+    def __init__(self, tokens_per_minute: int):
+        """Initialize the limiter with a full bucket.
+        
+        Args:
+            tokens_per_minute: Token budget refilled every minute
+        """
+        self.capacity = float(tokens_per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until the budget allows spending the given number of tokens.
+        
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        # A request larger than the bucket would otherwise wait forever
+        tokens = min(float(tokens), self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        # Waiters queue on the lock, so the budget is handed out in FIFO order
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+def _estimate_tokens(prompt: str) -> int:
+    """Roughly estimate the number of tokens in a prompt (~4 characters each)."""
+    return len(prompt) // 4 + 1
+
+def _is_transient(error: BaseException) -> bool:
+    """Check whether a failed model request is worth retrying.
+    
+    Args:
+        error: Exception raised by the request
+        
+    Returns:
+        True for network errors, timeouts, rate limiting (429) and server errors
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+class SemanticCache:
+    """Cache of model responses looked up by prompt embedding similarity.
+    
+    Uses a FAISS inner-product index when available, otherwise a NumPy
+    matrix. Embeddings must be L2-normalized so inner product is cosine.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl: Optional[float] = None,
+        max_candidates: int = 4,
+        path: Optional[str] = None
+    ):
+        """Initialize the cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds after which an entry expires (None for no expiry)
+            max_candidates: Neighbors to check when the nearest one is expired
+            path: File prefix to load the cache from and save it to (optional)
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_candidates = max_candidates
+        self.path = path
+        self._index = None
+        self._vectors: Optional[np.ndarray] = None
+        self._responses: List[str] = []
+        self._created: List[float] = []
+    
+    def __len__(self) -> int:
+        return len(self._responses)
+    
+    def lookup(self, embedding: np.ndarray) -> Optional[str]:
+        """Find a cached response for a similar prompt.
+        
+        Args:
+            embedding: Normalized prompt embedding
+            
+        Returns:
+            Cached response or None
+        """
+        if not self._responses:
+            return None
+        
+        k = min(self.max_candidates, len(self._responses))
+        query = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        if self._index is not None:
+            scores, ids = self._index.search(query, k)
+            candidates = zip(scores[0], ids[0])
+        else:
+            sims = self._vectors[:len(self._responses)] @ query[0]
+            top = np.argsort(-sims)[:k]
+            candidates = zip(sims[top], top)
+        
+        now = time.time()
+        for score, i in candidates:
+            if score < self.threshold:
+                break
+            if self.ttl is None or now - self._created[i] <= self.ttl:
+                return self._responses[i]
+        return None
+    
+    def add(self, embedding: np.ndarray, response: str) -> None:
+        """Store a response under its prompt embedding.
+        
+        Args:
+            embedding: Normalized prompt embedding
+            response: Model response
+        """
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        n = len(self._responses)
+        if faiss is not None:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vector.shape[1])
+            self._index.add(vector)
+        else:
+            # Grow the matrix geometrically to keep appends amortized O(1)
+            if self._vectors is None:
+                self._vectors = np.empty((16, vector.shape[1]), dtype=np.float32)
+            elif n == len(self._vectors):
+                self._vectors = np.concatenate([self._vectors, np.empty_like(self._vectors)])
+            self._vectors[n] = vector[0]
+        self._responses.append(response)
+        self._created.append(time.time())
+    
+    def save(self) -> None:
+        """Write the cache to disk under its path prefix."""
+        if not self.path or not self._responses:
+            return
+        n = len(self._responses)
+        vectors = self._index.reconstruct_n(0, n) if self._index is not None else self._vectors[:n]
+        np.save(f"{self.path}.npy", vectors)
+        with open(f"{self.path}.json", "w") as f:
+            json.dump({"responses": self._responses, "created": self._created}, f)
+    
+    def load(self) -> None:
+        """Read the cache from disk if it was saved under its path prefix."""
+        if not self.path or not os.path.exists(f"{self.path}.json"):
+            return
+        with open(f"{self.path}.json") as f:
+            data = json.load(f)
+        vectors = np.load(f"{self.path}.npy")
+        
+        if faiss is not None:
+            self._index = faiss.IndexFlatIP(vectors.shape[1])
+            self._index.add(vectors)
+        else:
+            self._vectors = vectors
+        self._responses = data["responses"]
+        self._created = data["created"]
 
 class BaseAgent(ABC):
     """Base class for all agents in the AI Co-Scientist system.
@@ -10,16 +365,45 @@ class BaseAgent(ABC):
     Each agent has access to the Gemini model and can perform specific tasks.
     """
     
+    # HTTP session shared by all agents so model calls reuse keep-alive connections
+    _session: ClassVar[Optional[aiohttp.ClientSession]] = None
+    
+    # Exact-match cache of model responses shared by all agents
+    _response_cache: ClassVar[_ResponseCache] = _ResponseCache()
+    
+    # Similarity caches keyed by a digest of the model config and call parameters,
+    # created on first use when model_config["semantic_cache"] is set
+    _semantic_caches: ClassVar[Dict[str, SemanticCache]] = {}
+    
+    # Limits shared by all agents, created on first request from the model config
+    _rate_limiter: ClassVar[Optional[_RateLimiter]] = None
+    _request_semaphore: ClassVar[Optional[asyncio.Semaphore]] = None
+    
+    # Gemini context caches of shared prompt prefixes, keyed by model and prefix digest
+    _context_caches: ClassVar[Dict[bytes, Tuple[float, asyncio.Task]]] = {}
+    
+    # Event loop the shared session and limits above were created on
+    _loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    
     def __init__(self, model_config: Dict[str, Any], context_memory: Optional[Dict[str, Any]] = None):
         """Initialize the agent.
         
         Args:
             model_config: Configuration for the Gemini model
-            context_memory: Shared memory to store agent state and results
+            context_memory: Shared memory to store agent state and results, either
+                a ContextStore or a plain dict to wrap in an InMemoryStore
         """
         self.model_config = model_config
-        self.context_memory = context_memory or {}
+        if not isinstance(context_memory, ContextStore):
+            context_memory = InMemoryStore(context_memory)
+        self.context_memory = context_memory
         self.name = self.__class__.__name__
+        
+        self._model_digest: Optional[bytes] = None
+        
+        # Research goal cached against the version of the research plan it was read from
+        self._goal = ""
+        self._goal_version = -1
     
     @abstractmethod
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
@@ -33,19 +417,744 @@ class BaseAgent(ABC):
         """
         pass
     
-    async def _call_model(self, prompt: str, **kwargs) -> str:
+    async def execute_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several tasks assigned to this agent.
+        
+        Agents that can combine tasks into fewer model calls override this;
+        by default the tasks run concurrently through execute().
+        
+        Args:
+            tasks: Task parameters and context
+            
+        Returns:
+            Task results in task order
+        """
+        return list(await asyncio.gather(*(self.execute(task) for task in tasks)))
+    
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all agents.
+        
+        The session is created lazily so it binds to the running event loop,
+        and replaced if it was created on a loop that is no longer running.
+        
+        Returns:
+            Shared client session
+        """
+        cls._bind_loop()
+        if BaseAgent._session is None or BaseAgent._session.closed:
+            BaseAgent._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=200,
+                    limit_per_host=100,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300
+                ),
+                # Bound connecting and waiting for data, not whole (possibly streamed) responses
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=120)
+            )
+        return BaseAgent._session
+    
+    @classmethod
+    def _bind_loop(cls) -> None:
+        """Drop shared loop-bound state created on a different event loop.
+        
+        Sessions, semaphores and locks can't be used across event loops, e.g.
+        when run_co_scientist() is called with asyncio.run() more than once.
+        """
+        loop = asyncio.get_running_loop()
+        if BaseAgent._loop is loop:
+            return
+        BaseAgent._loop = loop
+        BaseAgent._session = None
+        BaseAgent._rate_limiter = None
+        BaseAgent._request_semaphore = None
+        BaseAgent._context_caches = {}
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP session and persist the semantic caches."""
+        for semantic_cache in BaseAgent._semantic_caches.values():
+            semantic_cache.save()
+        if BaseAgent._session is not None and not BaseAgent._session.closed:
+            await BaseAgent._session.close()
+        BaseAgent._session = None
+    
+    async def prewarm(self, n: int = 8) -> None:
+        """Open keep-alive connections to the model endpoint ahead of use.
+        
+        Issues concurrent HEAD requests so the first model calls reuse
+        connections that have already completed the TLS handshake.
+        
+        Args:
+            n: Number of connections to open
+        """
+        endpoint = self.model_config.get("endpoint")
+        if not endpoint:
+            return
+        
+        session = self.get_session()
+        
+        async def ping() -> None:
+            async with session.head(endpoint, headers=self._auth_headers()):
+                pass
+        
+        # Failures only mean the connection is opened by the first real call
+        await asyncio.gather(*(ping() for _ in range(n)), return_exceptions=True)
+    
+    async def _call_model(self, prompt: str, semantic_cache: bool = False, **kwargs) -> str:
         """Call the Gemini model with the given prompt.
         
         Args:
+            prompt: Instruction prompt for the model
+            semantic_cache: Whether a response to a similar prompt may be reused;
+                only for calls whose prompts differ in substance, not in a few
+                fields of a fixed template
+            **kwargs: Additional parameters for the model call
+            
+        Returns:
+            Model response as a string
+        """
+        cache_key = self._cache_key(prompt, **kwargs)
+        cached = await self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        similar = self._get_semantic_cache(**kwargs) if semantic_cache else None
+        if similar is not None:
+            embedding = (await self._embed([kwargs.get("system_instruction", "") + prompt]))[0]
+            cached = similar.lookup(embedding)
+            if cached is not None:
+                await self._response_cache.set(cache_key, cached)
+                return cached
+        
+        response = await self._request_model(prompt, **kwargs)
+        await self._response_cache.set(cache_key, response)
+        if similar is not None:
+            similar.add(embedding, response)
+        return response
+    
+    async def _call_model_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Call the Gemini model and yield the response as it is generated.
+        
+        Callers that only need the beginning of a response can stop iterating
+        early, which closes the connection. Only complete responses are cached.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            **kwargs: Additional parameters for the model call
+            
+        Yields:
+            Chunks of the model response
+        """
+        cache_key = self._cache_key(prompt, **kwargs)
+        cached = await self._response_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        endpoint = self.model_config.get("stream_endpoint")
+        if not endpoint:
+            if not self.model_config.get("endpoint"):
+                # No endpoint configured, return the placeholder in one chunk
+                yield await self._call_model(prompt, **kwargs)
+                return
+            endpoint = self.model_config["endpoint"].replace(":generateContent", ":streamGenerateContent")
+            endpoint += "&alt=sse" if "?" in endpoint else "?alt=sse"
+        
+        chunks = []
+        async with self._throttle(kwargs.get("system_instruction", "") + prompt):
+            async with self.get_session().post(
+                endpoint,
+                json=await self._build_request(prompt, **kwargs),
+                headers=self._auth_headers()
+            ) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    text = self._extract_text(json.loads(line[len(b"data:"):]))
+                    if text:
+                        chunks.append(text)
+                        yield text
+        
+        await self._response_cache.set(cache_key, "".join(chunks))
+    
+    def _get_semantic_cache(self, **kwargs) -> Optional[SemanticCache]:
+        """Get the shared semantic cache for a kind of call, if enabled in the model config.
+        
+        Calls with a different model config or different parameters (e.g.
+        response_schema) use separate caches, so they never get each
+        other's responses.
+        
+        Args:
+            **kwargs: Additional parameters of the model call
+            
+        Returns:
+            Semantic cache or None if disabled
+        """
+        config = self.model_config.get("semantic_cache")
+        if not config:
+            return None
+        
+        partition = hashlib.blake2b(self._config_digest(), digest_size=8)
+        if kwargs:
+            partition.update(json.dumps(kwargs, sort_keys=True, default=str).encode())
+        partition = partition.hexdigest()
+        
+        semantic_cache = BaseAgent._semantic_caches.get(partition)
+        if semantic_cache is None:
+            options = config if isinstance(config, dict) else {}
+            path = options.get("path")
+            semantic_cache = BaseAgent._semantic_caches[partition] = SemanticCache(
+                threshold=options.get("threshold", 0.92),
+                ttl=options.get("ttl"),
+                path=f"{path}.{partition}" if path else None
+            )
+            semantic_cache.load()
+        return semantic_cache
+    
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the configured embedding model.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            L2-normalized embeddings of shape (len(texts), dim)
+        """
+        endpoint = self.model_config.get("embedding_endpoint")
+        if not endpoint:
+            # No endpoint configured, use placeholder embeddings
+            return _hash_embeddings(texts)
+        
+        # batchEmbedContents accepts at most 100 texts per request
+        batch_size = self.model_config.get("embedding_batch_size", 100)
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(self._embed_batch(endpoint, batch) for batch in batches))
+        return _normalize(np.concatenate(results)) if results else _hash_embeddings(texts)
+    
+    async def _embed_batch(self, endpoint: str, texts: List[str]) -> np.ndarray:
+        """Embed one batch of texts in a single embedding request.
+        
+        Args:
+            endpoint: Batch embedding endpoint URL
+            texts: Texts to embed
+            
+        Returns:
+            Unnormalized embeddings of shape (len(texts), dim)
+        """
+        model = self.model_config.get("embedding_model", "models/text-embedding-004")
+        payload = {
+            "requests": [
+                {"model": model, "content": {"parts": [{"text": text}]}}
+                for text in texts
+            ]
+        }
+        async with self.get_session().post(
+            endpoint,
+            json=payload,
+            headers=self._auth_headers()
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        
+        return np.asarray([e["values"] for e in data["embeddings"]], dtype=np.float32)
+    
+    def _cache_key(self, prompt: str, **kwargs) -> bytes:
+        """Hash a model request for the response cache.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            **kwargs: Additional parameters for the model call
+            
+        Returns:
+            Digest identifying the request
+        """
+        key = hashlib.blake2b(self._config_digest(), digest_size=16)
+        key.update(prompt.encode())
+        if kwargs:
+            key.update(b"\0")
+            key.update(json.dumps(kwargs, sort_keys=True, default=str).encode())
+        return key.digest()
+    
+    def _config_digest(self) -> bytes:
+        """Hash the model config once, since it doesn't change after construction.
+        
+        Returns:
+            Digest of the model config
+        """
+        if self._model_digest is None:
+            config = json.dumps(dict(self.model_config), sort_keys=True, default=str)
+            self._model_digest = hashlib.blake2b(config.encode(), digest_size=16).digest()
+        return self._model_digest
+    
+    async def _request_model(self, prompt: str, **kwargs) -> str:
+        """Send a request to the Gemini API, bypassing the cache.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            **kwargs: Additional parameters for the model call
+            
+        Returns:
+            Model response as a string
+        """
+        endpoint = self.model_config.get("endpoint")
+        if not endpoint:
+            # No endpoint configured, return a placeholder
+            return f"Model response to: {prompt[:30]}..."
+        
+        # Retry transient failures with jittered exponential backoff
+        max_attempts = self.model_config.get("max_retries", 5)
+        for attempt in range(max_attempts):
+            try:
+                async with self._throttle(kwargs.get("system_instruction", "") + prompt):
+                    return await self._post_model(endpoint, prompt, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if not _is_transient(error) or attempt == max_attempts - 1:
+                    raise
+                await asyncio.sleep(min(2 ** attempt + random.random(), 30.0))
+    
+    async def _post_model(self, endpoint: str, prompt: str, **kwargs) -> str:
+        """Send a single generateContent request.
+        
+        Args:
+            endpoint: Model endpoint URL
             prompt: Instruction prompt for the model
             **kwargs: Additional parameters for the model call
             
         Returns:
             Model response as a string
         """
-        # This would be implemented to call the actual Gemini API
-        # For now, we'll return a placeholder
-        return f"Model response to: {prompt[:30]}..."
+        async with self.get_session().post(
+            endpoint,
+            json=await self._build_request(prompt, **kwargs),
+            headers=self._auth_headers()
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        
+        return self._extract_text(data)
+    
+    async def _build_request(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build the request body, referencing a context cache for the system instruction if possible.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            **kwargs: Additional parameters for the model call
+            
+        Returns:
+            Request payload
+        """
+        payload = self._build_payload(prompt, **kwargs)
+        system_instruction = kwargs.get("system_instruction")
+        if system_instruction:
+            cache_name = await self._context_cache(system_instruction)
+            if cache_name is not None:
+                del payload["systemInstruction"]
+                payload["cachedContent"] = cache_name
+        return payload
+    
+    async def _context_cache(self, system_instruction: str) -> Optional[str]:
+        """Get a Gemini context cache holding a system instruction.
+        
+        With model_config["context_cache"] set, a prefix shared by many calls
+        (such as the research goal) is uploaded once as a cachedContents
+        resource, and later calls are billed the cached-token rate for it.
+        Caches are recreated shortly before model_config["context_cache_ttl"]
+        (seconds, default 3600) runs out.
+        
+        Args:
+            system_instruction: Stable prompt prefix
+            
+        Returns:
+            Name of the cached content, or None to send the prefix inline
+        """
+        if not self.model_config.get("context_cache"):
+            return None
+        match = re.match(r"(.*/)(models/[^/:]+):", self.model_config.get("endpoint", ""))
+        if match is None:
+            return None
+        
+        self._bind_loop()
+        base_url, model = match.groups()
+        key = hashlib.blake2b(f"{model}\0{system_instruction}".encode(), digest_size=16).digest()
+        ttl = self.model_config.get("context_cache_ttl", 3600)
+        
+        entry = BaseAgent._context_caches.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            task = asyncio.ensure_future(
+                self._create_context_cache(f"{base_url}cachedContents", model, system_instruction, ttl)
+            )
+            entry = BaseAgent._context_caches[key] = (time.monotonic() + 0.9 * ttl, task)
+        # Shield the shared creation from cancellation of any single caller
+        return await asyncio.shield(entry[1])
+    
+    async def _create_context_cache(
+        self,
+        endpoint: str,
+        model: str,
+        system_instruction: str,
+        ttl: float
+    ) -> Optional[str]:
+        """Create a cachedContents resource for a system instruction.
+        
+        Args:
+            endpoint: cachedContents endpoint URL
+            model: Model the cache is created for
+            system_instruction: Text to cache
+            ttl: Lifetime of the cache in seconds
+            
+        Returns:
+            Name of the cached content, or None if the API refused to cache it
+            (e.g. because it is shorter than the model's minimum)
+        """
+        payload = {
+            "model": model,
+            "systemInstruction": {"parts": [{"text": system_instruction}]},
+            "ttl": f"{int(ttl)}s"
+        }
+        try:
+            async with self.get_session().post(
+                endpoint,
+                json=payload,
+                headers=self._auth_headers()
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        return data.get("name")
+    
+    @asynccontextmanager
+    async def _throttle(self, prompt: str) -> AsyncIterator[None]:
+        """Hold a slot of the shared request limits for the duration of a call.
+        
+        Waits for the tokens-per-minute budget (model_config["tokens_per_minute"])
+        and caps in-flight requests at model_config["max_concurrency"].
+        
+        Args:
+            prompt: Prompt being sent, used to estimate its token cost
+        """
+        self._bind_loop()
+        tokens_per_minute = self.model_config.get("tokens_per_minute")
+        if tokens_per_minute:
+            if BaseAgent._rate_limiter is None:
+                BaseAgent._rate_limiter = _RateLimiter(tokens_per_minute)
+            await BaseAgent._rate_limiter.acquire(_estimate_tokens(prompt))
+        
+        if BaseAgent._request_semaphore is None:
+            BaseAgent._request_semaphore = asyncio.Semaphore(self.model_config.get("max_concurrency", 10))
+        async with BaseAgent._request_semaphore:
+            yield
+    
+    async def _request_batch(
+        self,
+        prompts: Dict[str, str],
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """Run prompts through the provider's Batch API.
+        
+        Uploads a JSONL file of chat completion requests, polls the batch
+        until it finishes and downloads the output file. Authenticates with
+        model_config["batch_api_key"], or else the key used for direct calls.
+        
+        Args:
+            prompts: Prompts keyed by custom ID
+            response_schema: JSON schema the responses must follow (optional)
+            
+        Returns:
+            Responses keyed by custom ID; failed requests are omitted
+            
+        Raises:
+            ValueError: If no batch endpoint or API key is configured
+        """
+        base_url = self.model_config.get("batch_endpoint", "").rstrip("/")
+        if not base_url:
+            raise ValueError("No batch endpoint configured")
+        api_key = self.model_config.get("batch_api_key") or self._api_key()
+        if not api_key:
+            raise ValueError("No API key configured for the batch endpoint")
+        headers = {"Authorization": f"Bearer {api_key}"}
+        model = self.model_config.get("batch_model", self.model_config.get("model_name"))
+        
+        body = {
+            "model": model,
+            "temperature": self.model_config.get("temperature", 0.7),
+            "max_tokens": self.model_config.get("max_tokens", 8192)
+        }
+        if response_schema is not None:
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": response_schema}
+            }
+        
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {**body, "messages": [{"role": "user", "content": prompt}]}
+            })
+            for custom_id, prompt in prompts.items()
+        ]
+        
+        session = self.get_session()
+        
+        # Upload the requests and create the batch
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", "\n".join(lines).encode(), filename="batch.jsonl")
+        async with session.post(f"{base_url}/files", data=form, headers=headers) as response:
+            response.raise_for_status()
+            input_file = await response.json()
+        
+        async with session.post(
+            f"{base_url}/batches",
+            json={
+                "input_file_id": input_file["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            },
+            headers=headers
+        ) as response:
+            response.raise_for_status()
+            batch = await response.json()
+        
+        # Poll until the batch reaches a terminal status
+        poll_interval = self.model_config.get("batch_poll_interval", 30.0)
+        while batch.get("status") not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            async with session.get(f"{base_url}/batches/{batch['id']}", headers=headers) as response:
+                response.raise_for_status()
+                batch = await response.json()
+        
+        if not batch.get("output_file_id"):
+            return {}
+        
+        async with session.get(
+            f"{base_url}/files/{batch['output_file_id']}/content",
+            headers=headers
+        ) as response:
+            response.raise_for_status()
+            output = await response.text()
+        
+        # Demultiplex responses by custom ID
+        responses = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                responses[record["custom_id"]] = choices[0]["message"]["content"]
+        
+        return responses
+    
+    def _build_payload(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build the request body for a Gemini generateContent call.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            **kwargs: Overrides for the generation config; response_schema
+                requests JSON output following the given schema and
+                system_instruction sets a stable prefix sent before the prompt
+            
+        Returns:
+            Request payload
+        """
+        generation_config = {
+            "temperature": kwargs.get("temperature", self.model_config.get("temperature", 0.7)),
+            "maxOutputTokens": kwargs.get("max_tokens", self.model_config.get("max_tokens", 8192))
+        }
+        if kwargs.get("response_schema") is not None:
+            generation_config["responseMimeType"] = "application/json"
+            generation_config["responseSchema"] = kwargs["response_schema"]
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": generation_config
+        }
+        if kwargs.get("system_instruction"):
+            payload["systemInstruction"] = {"parts": [{"text": kwargs["system_instruction"]}]}
+        return payload
+    
+    def _api_key(self) -> str:
+        """Get the API key for the model API.
+        
+        Returns:
+            model_config["api_key"], or else the GEMINI_API_KEY environment variable
+        """
+        return self.model_config.get("api_key") or os.environ.get("GEMINI_API_KEY", "")
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Get the authentication headers for the model API.
+        
+        Returns:
+            Request headers
+        """
+        return {"x-goog-api-key": self._api_key()}
+    
+    def _extract_text(self, data: Dict[str, Any]) -> str:
+        """Extract the generated text from a Gemini response.
+        
+        Args:
+            data: Decoded response body
+            
+        Returns:
+            Concatenated text of the first candidate
+        """
+        candidates = data.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+    
+    async def _gather_bounded(self, coros: Iterable[Awaitable[Any]]) -> List[Any]:
+        """Run awaitables concurrently, at most max_concurrency at a time.
+        
+        Args:
+            coros: Awaitables to run
+            
+        Returns:
+            Results in input order; exceptions are returned instead of raised
+        """
+        semaphore = asyncio.Semaphore(self.model_config.get("max_concurrency", 10))
+        
+        async def run(coro: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+    
+    def get_hypothesis(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        """Get a hypothesis by ID in constant time.
+        
+        Args:
+            hypothesis_id: ID of the hypothesis
+            
+        Returns:
+            Hypothesis or None if not found
+        """
+        return self.context_memory.get_hypothesis(hypothesis_id)
+    
+    def get_hypotheses(self, hypothesis_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Get the hypotheses with the given IDs, skipping unknown ones.
+        
+        Args:
+            hypothesis_ids: IDs of the hypotheses
+            
+        Returns:
+            Hypotheses found, in the order of the IDs
+        """
+        hypotheses = (self.context_memory.get_hypothesis(i) for i in hypothesis_ids)
+        return [h for h in hypotheses if h is not None]
+    
+    async def add_hypothesis(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a hypothesis to the context memory.
+        
+        Args:
+            hypothesis: Hypothesis to add
+            
+        Returns:
+            The stored hypothesis, which is an existing one if it is a duplicate
+        """
+        return (await self.add_hypotheses([hypothesis]))[0]
+    
+    async def add_hypotheses(
+        self,
+        new_hypotheses: List[Dict[str, Any]],
+        dedupe: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Add hypotheses to the context memory.
+        
+        The hypotheses list is extended in place. Unless dedupe is False,
+        hypotheses with the same statement and rationale as an existing one
+        are not added again.
+        
+        Args:
+            new_hypotheses: Hypotheses to add
+            dedupe: Whether to skip duplicates of stored hypotheses
+            
+        Returns:
+            The stored hypothesis for each input, either itself or the existing duplicate
+        """
+        async with self.context_memory.lock("hypotheses"):
+            return self.context_memory.add_hypotheses(new_hypotheses, dedupe)
+    
+    async def _hypothesis_embeddings(self) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Get the hypotheses with their embeddings as a single matrix.
+        
+        The (N, D) matrix is kept in context memory row-aligned with the
+        hypotheses list, so only hypotheses added since the last call are
+        embedded. It is stored as model_config["embedding_dtype"] (float16 by
+        default) to halve its memory footprint.
+        
+        Returns:
+            Hypotheses and their L2-normalized embeddings
+        """
+        dtype = np.dtype(self.model_config.get("embedding_dtype", "float16"))
+        async with self.context_memory.lock("hypothesis_embeddings"):
+            hypotheses = self.get_from_context_memory("hypotheses", [])
+            embeddings = self.get_from_context_memory("hypothesis_embeddings")
+            if embeddings is not None:
+                embeddings = np.asarray(embeddings, dtype=dtype)
+            
+            # The list only grows by appending; anything else invalidates the matrix
+            if embeddings is None or len(embeddings) > len(hypotheses):
+                embeddings = None
+            
+            start = 0 if embeddings is None else len(embeddings)
+            if start < len(hypotheses):
+                texts = [f"{h.get('title', '')}\n{h.get('statement', '')}" for h in hypotheses[start:]]
+                new_embeddings = (await self._embed(texts)).astype(dtype)
+                embeddings = _append_rows(embeddings, new_embeddings)
+                self.update_context_memory("hypothesis_embeddings", embeddings)
+        
+        if embeddings is None:
+            embeddings = np.zeros((0, PLACEHOLDER_EMBEDDING_DIM), dtype=dtype)
+        # The list grows in place, so cut it to the rows that were embedded
+        return hypotheses[:len(embeddings)], embeddings
+    
+    async def _similar_hypothesis_pairs(self, k: int) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Find the most similar pairs of hypotheses.
+        
+        Args:
+            k: Number of pairs to return
+            
+        Returns:
+            Up to k hypothesis pairs, most similar first
+        """
+        hypotheses, embeddings = await self._hypothesis_embeddings()
+        return [(hypotheses[i], hypotheses[j]) for i, j in _similar_pairs(embeddings, k)]
+    
+    async def append_to_context_memory(self, key: str, item: Any) -> None:
+        """Append an item to a list in the shared context memory.
+        
+        The list is appended to in place and stored again, so stores that
+        serialize values see the change.
+        
+        Args:
+            key: Memory key of the list
+            item: Item to append
+        """
+        async with self.context_memory.lock(key):
+            current = self.get_from_context_memory(key)
+            if current is None:
+                current = []
+            current.append(item)
+            self.update_context_memory(key, current)
+    
+    def _research_goal(self) -> str:
+        """Get the raw research goal, re-reading it only when the research plan changes.
+        
+        Returns:
+            Raw research goal or an empty string if not yet available
+        """
+        version = self.context_memory.version("research_plan_config")
+        if version != self._goal_version:
+            self._goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
+            self._goal_version = version
+        return self._goal
     
     def update_context_memory(self, key: str, value: Any) -> None:
         """Update the shared context memory.
@@ -54,8 +1163,27 @@ class BaseAgent(ABC):
             key: Memory key
             value: Value to store
         """
-        if self.context_memory is not None:
-            self.context_memory[key] = value
+        self.context_memory[key] = value
+    
+    def update_context_memory_many(self, values: Dict[str, Any]) -> None:
+        """Update several keys of the shared context memory in one write.
+        
+        Args:
+            values: Memory keys and the values to store
+        """
+        self.context_memory.set_many(values)
+    
+    def update_context_memory_delta(self, key: str, changes: Dict[str, Any]) -> None:
+        """Update only the changed fields of a dict in the shared context memory.
+        
+        Stores that serialize values write just these fields, instead of
+        rewriting the whole dict.
+        
+        Args:
+            key: Memory key of the dict
+            changes: Changed fields and their new values
+        """
+        self.context_memory.update_fields(key, changes)
     
     def get_from_context_memory(self, key: str, default: Any = None) -> Any:
         """Get a value from the shared context memory.
@@ -67,6 +1195,4 @@ class BaseAgent(ABC):
         Returns:
             Stored value or default
         """
-        if self.context_memory is None:
-            return default
         return self.context_memory.get(key, default)
\ No newline at end of file
@@ -0,0 +1,371 @@
+"""Shared context memory stores for the AI Co-Scientist system."""
+
+import asyncio
+import hashlib
+import json
+from abc import abstractmethod
+from collections import deque
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+def content_hash(hypothesis: Dict[str, Any]) -> str:
+    """Hash the content of a hypothesis for duplicate detection.
+    
+    Args:
+        hypothesis: Hypothesis to hash
+    
+    Returns:
+        Hex digest of the statement and rationale
+    """
+    content = f"{hypothesis.get('statement', '')}\0{hypothesis.get('rationale', '')}"
+    return hashlib.sha1(content.encode()).hexdigest()
+
+def _json_default(value: Any) -> Any:
+    """Encode values json cannot serialize, such as NumPy arrays."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (deque, set, frozenset)):
+        return list(value)
+    return str(value)
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to JSON, with orjson when it is installed.
+    
+    Args:
+        value: Value to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=_json_default).encode()
+
+def _loads(data: bytes) -> Any:
+    """Deserialize JSON written by _dumps."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class ContextStore(MutableMapping):
+    """Key-value store backing the context memory shared by agents.
+    
+    Besides the mapping interface, stores provide hypothesis lookups and
+    appends so that backends can avoid rewriting the whole hypotheses list.
+    """
+    
+    HYPOTHESES_KEY = "hypotheses"
+    
+    def __init__(self):
+        """Initialize the store."""
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._locks_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._versions: Dict[str, int] = {}
+    
+    def lock(self, key: str) -> asyncio.Lock:
+        """Get the lock guarding read-modify-write updates of a key.
+        
+        Args:
+            key: Memory key
+        
+        Returns:
+            Lock for the key, shared by all agents using this store
+        """
+        # Locks are bound to the event loop they are used on, so start over on a new loop
+        loop = asyncio.get_running_loop()
+        if loop is not self._locks_loop:
+            self._locks = {}
+            self._locks_loop = loop
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+    
+    def version(self, key: str) -> int:
+        """Get a counter that changes whenever a key is written through this store.
+        
+        Agents use it to cache values derived from a key.
+        
+        Args:
+            key: Memory key
+            
+        Returns:
+            Number of writes to the key
+        """
+        return self._versions.get(key, 0)
+    
+    def _bump(self, key: str) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+    
+    def set_many(self, values: Dict[str, Any]) -> None:
+        """Set several keys at once.
+        
+        Stores backed by a server override this to write all keys in one
+        round trip.
+        
+        Args:
+            values: Memory keys and the values to store
+        """
+        for key, value in values.items():
+            self[key] = value
+    
+    def update_fields(self, key: str, fields: Dict[str, Any]) -> None:
+        """Update some fields of a dict value, creating it if missing.
+        
+        Stores that serialize values override this to write only the
+        given fields instead of the whole dict.
+        
+        Args:
+            key: Memory key of the dict
+            fields: Fields to set
+        """
+        value = self.get(key)
+        if value is None:
+            value = {}
+        value.update(fields)
+        self[key] = value
+    
+    @abstractmethod
+    def get_hypothesis(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        """Get a hypothesis by ID.
+        
+        Args:
+            hypothesis_id: ID of the hypothesis
+        
+        Returns:
+            Hypothesis or None if not found
+        """
+        pass
+    
+    @abstractmethod
+    def add_hypotheses(self, new_hypotheses: List[Dict[str, Any]], dedupe: bool = True) -> List[Dict[str, Any]]:
+        """Append hypotheses, skipping ones whose content is already stored.
+        
+        Args:
+            new_hypotheses: Hypotheses to add
+            dedupe: Whether to skip duplicates; if False every hypothesis is appended
+        
+        Returns:
+            The stored hypothesis for each input, either itself or the existing duplicate
+        """
+        pass
+
+class InMemoryStore(ContextStore):
+    """Context store backed by a dict in the current process."""
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """Initialize the store.
+        
+        Args:
+            data: Dict to store values in, shared with the caller
+        """
+        super().__init__()
+        self.data = data if data is not None else {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self._bump(key)
+    
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self._bump(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def get_hypothesis(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        return self._index().get(hypothesis_id)
+    
+    def add_hypotheses(self, new_hypotheses: List[Dict[str, Any]], dedupe: bool = True) -> List[Dict[str, Any]]:
+        index = self._index()
+        stored, added = [], []
+        for hypothesis in new_hypotheses:
+            key = content_hash(hypothesis)
+            existing_id = self._hashes.get(key)
+            if existing_id is not None and dedupe:
+                stored.append(index[existing_id])
+                continue
+            self._hashes.setdefault(key, hypothesis["id"])
+            index[hypothesis["id"]] = hypothesis
+            stored.append(hypothesis)
+            added.append(hypothesis)
+        
+        # Extend the list in place instead of copying it on every addition
+        if added:
+            hypotheses = self.data.get(self.HYPOTHESES_KEY)
+            if hypotheses is None:
+                hypotheses = self.data[self.HYPOTHESES_KEY] = []
+            hypotheses.extend(added)
+            self._bump(self.HYPOTHESES_KEY)
+        return stored
+    
+    def _index(self) -> Dict[str, Dict[str, Any]]:
+        """Get the ID -> hypothesis index, rebuilding it if the list was replaced.
+        
+        Returns:
+            Dictionary mapping hypothesis IDs to hypotheses
+        """
+        hypotheses = self.data.get(self.HYPOTHESES_KEY, [])
+        if len(self._by_id) != len(hypotheses):
+            self._by_id = {h["id"]: h for h in hypotheses}
+            self._hashes = {}
+            for h in hypotheses:
+                self._hashes.setdefault(content_hash(h), h["id"])
+        return self._by_id
+
+class RedisStore(ContextStore):
+    """Context store backed by Redis, shared across processes and machines.
+    
+    Hypotheses are stored one per key (``hyp:{id}``) with their order kept in
+    the ``hypotheses:ids`` list, so adding a hypothesis does not rewrite the
+    whole list. Other values are stored as JSON under ``ctx:{key}``; fields
+    written with update_fields go to the ``fields:{key}`` hash and are merged
+    over that value when it is read.
+    Versions only count writes made through this process's store.
+    """
+    
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "cosci:", client: Any = None):
+        """Initialize the store.
+        
+        Args:
+            url: Redis connection URL, used when no client is given
+            prefix: Prefix of all keys written by this store
+            client: Existing Redis client to use
+        """
+        if client is None:
+            if redis is None:
+                raise ImportError("RedisStore requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self._ids_key = f"{prefix}hypotheses:ids"
+        self._hashes_key = f"{prefix}hypotheses:hashes"
+    
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}ctx:{key}"
+    
+    def _hyp_key(self, hypothesis_id: str) -> str:
+        return f"{self.prefix}hyp:{hypothesis_id}"
+    
+    def _fields_key(self, key: str) -> str:
+        return f"{self.prefix}fields:{key}"
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == self.HYPOTHESES_KEY:
+            ids = [i.decode() for i in self.client.lrange(self._ids_key, 0, -1)]
+            if not ids:
+                raise KeyError(key)
+            values = self.client.mget([self._hyp_key(i) for i in ids])
+            return [_loads(v) for v in values if v is not None]
+        
+        pipe = self.client.pipeline()
+        pipe.get(self._key(key))
+        pipe.hgetall(self._fields_key(key))
+        value, fields = pipe.execute()
+        if value is None and not fields:
+            raise KeyError(key)
+        if not fields:
+            return _loads(value)
+        
+        result = _loads(value) if value is not None else {}
+        result.update({field.decode(): _loads(v) for field, v in fields.items()})
+        return result
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == self.HYPOTHESES_KEY:
+            pipe = self.client.pipeline()
+            pipe.delete(self._ids_key, self._hashes_key)
+            for hypothesis in value:
+                pipe.set(self._hyp_key(hypothesis["id"]), _dumps(hypothesis))
+                pipe.rpush(self._ids_key, hypothesis["id"])
+                pipe.hsetnx(self._hashes_key, content_hash(hypothesis), hypothesis["id"])
+            pipe.execute()
+        else:
+            pipe = self.client.pipeline()
+            pipe.set(self._key(key), _dumps(value))
+            pipe.delete(self._fields_key(key))
+            pipe.execute()
+        self._bump(key)
+    
+    def __delitem__(self, key: str) -> None:
+        if key == self.HYPOTHESES_KEY:
+            ids = [i.decode() for i in self.client.lrange(self._ids_key, 0, -1)]
+            if not ids:
+                raise KeyError(key)
+            self.client.delete(self._ids_key, self._hashes_key, *(self._hyp_key(i) for i in ids))
+        elif not self.client.delete(self._key(key), self._fields_key(key)):
+            raise KeyError(key)
+        self._bump(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        if self.client.exists(self._ids_key):
+            yield self.HYPOTHESES_KEY
+        keys = set()
+        for pattern in (self._key(""), self._fields_key("")):
+            start = len(pattern)
+            for key in self.client.scan_iter(match=pattern + "*"):
+                keys.add(key.decode()[start:])
+        yield from keys
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def set_many(self, values: Dict[str, Any]) -> None:
+        values = dict(values)
+        if self.HYPOTHESES_KEY in values:
+            self[self.HYPOTHESES_KEY] = values.pop(self.HYPOTHESES_KEY)
+        if not values:
+            return
+        
+        pipe = self.client.pipeline()
+        for key, value in values.items():
+            pipe.set(self._key(key), _dumps(value))
+        pipe.delete(*(self._fields_key(key) for key in values))
+        pipe.execute()
+        for key in values:
+            self._bump(key)
+    
+    def update_fields(self, key: str, fields: Dict[str, Any]) -> None:
+        if fields:
+            self.client.hset(self._fields_key(key), mapping={field: _dumps(v) for field, v in fields.items()})
+            self._bump(key)
+    
+    def get_hypothesis(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        value = self.client.get(self._hyp_key(hypothesis_id))
+        return _loads(value) if value is not None else None
+    
+    def add_hypotheses(self, new_hypotheses: List[Dict[str, Any]], dedupe: bool = True) -> List[Dict[str, Any]]:
+        stored = []
+        for hypothesis in new_hypotheses:
+            # HSETNX makes the duplicate check atomic across processes
+            key = content_hash(hypothesis)
+            if not self.client.hsetnx(self._hashes_key, key, hypothesis["id"]) and dedupe:
+                existing_id = self.client.hget(self._hashes_key, key).decode()
+                stored.append(self.get_hypothesis(existing_id) or hypothesis)
+                continue
+            pipe = self.client.pipeline()
+            pipe.set(self._hyp_key(hypothesis["id"]), _dumps(hypothesis))
+            pipe.rpush(self._ids_key, hypothesis["id"])
+            pipe.execute()
+            stored.append(hypothesis)
+        self._bump(self.HYPOTHESES_KEY)
+        return stored
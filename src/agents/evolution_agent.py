@@ -1,9 +1,177 @@
 """Evolution agent for improving and refining research hypotheses."""
 
-import uuid
-from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import random
+import string
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, new_id
+
+logger = logging.getLogger(__name__)
+
+# JSON schema the model must follow for evolved and combined hypotheses
+EVOLVED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "statement": {"type": "string"},
+        "rationale": {"type": "string"},
+        "testability": {"type": "string"}
+    },
+    "required": ["title", "statement", "rationale", "testability"]
+}
+
+def _parse_evolved(response: str) -> Dict[str, str]:
+    """Parse a structured evolution response.
+    
+    Args:
+        response: Model response, expected to be JSON following EVOLVED_SCHEMA
+        
+    Returns:
+        Hypothesis fields present in the response; empty if it is not valid JSON
+    """
+    try:
+        data = json.loads(response)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        field: value for field, value in data.items()
+        if field in EVOLVED_SCHEMA["properties"] and isinstance(value, str) and value
+    }
+
+def _evolved_from(defaults: Dict[str, Any], response: str) -> Dict[str, Any]:
+    """Build an evolved hypothesis from the model response.
+    
+    Fields the model returned take precedence over the defaults. The default
+    statement names the source hypotheses and technique, so hypotheses built
+    from unparsed responses are not content duplicates of each other.
+    
+    Args:
+        defaults: Hypothesis fields to use where the response has none
+        response: Model response string
+        
+    Returns:
+        Evolved hypothesis
+    """
+    return {**defaults, **_parse_evolved(response)}
+
+# Dedicated generator for technique selection; seed it for reproducible runs
+_RNG = random.Random()
+
+_ENHANCE_TMPL = string.Template("""Enhance the following research hypothesis through grounding in literature:
+
+HYPOTHESIS:
+${statement}
+
+RATIONALE:
+${rationale}
+
+To enhance this hypothesis:
+1. Identify any weaknesses or gaps in the hypothesis
+2. Generate 3 search queries to find relevant literature
+3. Simulate searching and reading articles based on these queries
+4. Use the found information to enhance the hypothesis
+5. Elaborate on details to fill reasoning gaps
+
+Provide an enhanced version with:
+- Refined hypothesis statement
+- Expanded rationale with literature support
+- Improved testability based on experimental approaches found in literature
+""")
+
+_IMPROVE_TMPL = string.Template("""Improve the coherence, practicality, and feasibility of the following research hypothesis:
+
+HYPOTHESIS:
+${statement}
+
+RATIONALE:
+${rationale}
+
+TESTABILITY:
+${testability}
+
+To improve this hypothesis:
+1. Identify any logical inconsistencies or unclear aspects
+2. Make the hypothesis more coherent by clarifying relationships
+3. Improve practicality by considering resource constraints
+4. Enhance feasibility by suggesting more accessible experimental approaches
+5. Address any underlying problems with potentially invalid assumptions
+
+Provide an improved version with:
+- More coherent hypothesis statement
+- Clarified rationale that addresses any inconsistencies
+- More practical and feasible testing approach
+""")
+
+_SIMPLIFY_TMPL = string.Template("""Simplify the following research hypothesis for easier verification and testing:
+
+HYPOTHESIS:
+${statement}
+
+RATIONALE:
+${rationale}
+
+TESTABILITY:
+${testability}
+
+To simplify this hypothesis:
+1. Identify the core claim or relationship being proposed
+2. Remove any unnecessary complexity or dependencies
+3. Break down complex mechanisms into simpler components
+4. Focus on the most essential and verifiable aspects
+5. Simplify the testing approach to require fewer resources
+
+Provide a simplified version with:
+- Clearer and more focused hypothesis statement
+- Streamlined rationale that explains the core idea
+- Simplified testing approach that requires fewer resources
+""")
+
+_OUT_OF_BOX_TMPL = string.Template("""Generate a completely new, out-of-the-box hypothesis for the research goal,
+diverging from but inspired by the following hypothesis:
+
+RESEARCH GOAL:
+${research_goal}
+
+INSPIRATION HYPOTHESIS:
+${statement}
+
+To create an out-of-the-box hypothesis:
+1. Identify the fundamental assumptions in the original hypothesis
+2. Challenge or invert these assumptions
+3. Apply analogies from different fields of science
+4. Explore counterintuitive or unconventional mechanisms
+5. Consider alternative paradigms that could explain the same phenomena
+
+Provide a novel, divergent hypothesis with:
+- Bold hypothesis statement that takes a different approach
+- Rationale explaining the unconventional thinking
+- Testability approach for this novel perspective
+""")
+
+_COMBINE_TMPL = string.Template("""Combine the following research hypotheses into a single, unified hypothesis:
+
+${hypothesis_statements}
+
+RATIONALES:
+${hypothesis_rationales}
+
+To combine these hypotheses:
+1. Identify the common themes and complementary aspects
+2. Extract the strengths from each hypothesis
+3. Create a synthesis that addresses the limitations of individual hypotheses
+4. Develop a unified mechanism or explanation
+5. Ensure the combined hypothesis is coherent and testable
+
+Provide a combined hypothesis with:
+- Unified hypothesis statement
+- Integrated rationale that shows how the combination improves upon individual hypotheses
+- Comprehensive testing approach
+""")
 
 class EvolutionAgent(BaseAgent):
     """Agent for continuously refining and improving research hypotheses.
@@ -34,15 +202,115 @@ class EvolutionAgent(BaseAgent):
                 return {"error": "Missing hypothesis_id"}
                 
             return await self._evolve_hypothesis(hypothesis_id)
+        elif task_type == "evolve_hypothesis_all":
+            hypothesis_id = task.get("hypothesis_id")
+            if not hypothesis_id:
+                return {"error": "Missing hypothesis_id"}
+                
+            return await self._evolve_hypothesis_all(hypothesis_id)
         elif task_type == "combine_hypotheses":
             hypothesis_ids = task.get("hypothesis_ids", [])
             if not hypothesis_ids or len(hypothesis_ids) < 2:
                 return {"error": "Need at least 2 hypothesis_ids"}
                 
             return await self._combine_hypotheses(hypothesis_ids)
+        elif task_type == "combine_similar_hypotheses":
+            return await self._combine_similar_hypotheses(task.get("num_pairs", 1))
         else:
             return {"error": f"Unknown task type: {task_type}"}
     
+    async def execute_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several evolution tasks together.
+        
+        With model_config["batch_mode"] and model_config["batch_endpoint"]
+        set, the prompts of all evolve and combine tasks are submitted as a
+        single provider batch job, which is cheaper for offline evolution
+        sweeps. Otherwise the tasks run concurrently through execute().
+        
+        Args:
+            tasks: Evolution tasks
+            
+        Returns:
+            Evolution results in task order
+        """
+        if not (self.model_config.get("batch_mode") and self.model_config.get("batch_endpoint")):
+            return list(await asyncio.gather(*(self.execute(task) for task in tasks)))
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        
+        # Build one prompt per task, remembering how to finalize its result
+        prompts = {}
+        pending = {}
+        direct = []
+        for i, task in enumerate(tasks):
+            task_type = task.get("task_type", "evolve_hypothesis")
+            custom_id = f"task-{i}"
+            
+            if task_type == "evolve_hypothesis":
+                hypothesis_id = task.get("hypothesis_id")
+                hypothesis = self.get_hypothesis(hypothesis_id)
+                if not hypothesis:
+                    results[i] = {"error": f"Hypothesis {hypothesis_id} not found"}
+                    continue
+                    
+                name = _RNG.choice(self._evolution_techniques()).__name__
+                prompts[custom_id] = getattr(self, f"{name}_prompt")(hypothesis)
+                pending[custom_id] = (i, name, hypothesis)
+            elif task_type == "combine_hypotheses":
+                hypothesis_ids = task.get("hypothesis_ids", [])
+                hypotheses_to_combine = self.get_hypotheses(hypothesis_ids)
+                if len(hypotheses_to_combine) < 2:
+                    results[i] = {"error": "Not enough hypotheses found to combine"}
+                    continue
+                    
+                prompts[custom_id] = self._combine_prompt(hypotheses_to_combine)
+                pending[custom_id] = (i, "_combine", hypotheses_to_combine)
+            else:
+                direct.append(i)
+        
+        # Tasks that can't be batched run directly
+        for i, result in zip(direct, await asyncio.gather(*(self.execute(tasks[i]) for i in direct))):
+            results[i] = result
+        
+        responses = {}
+        if prompts:
+            responses = await self._request_batch(prompts, response_schema=EVOLVED_SCHEMA)
+        
+        # Fall back to direct calls for requests that failed in the batch
+        missing = [custom_id for custom_id in pending if custom_id not in responses]
+        fallback = await asyncio.gather(*(
+            self._call_model(prompts[c], semantic_cache=True, response_schema=EVOLVED_SCHEMA) for c in missing
+        ), return_exceptions=True)
+        for custom_id, response in zip(missing, fallback):
+            if isinstance(response, BaseException):
+                i = pending.pop(custom_id)[0]
+                logger.warning("Evolution task %d failed in the batch and directly", i, exc_info=response)
+                results[i] = {"error": str(response)}
+            else:
+                responses[custom_id] = response
+        
+        # Route each response back to the hypotheses it came from
+        new_hypotheses = [
+            getattr(self, f"{name}_result")(source, responses[custom_id])
+            for custom_id, (_, name, source) in pending.items()
+        ]
+        stored = await self.add_hypotheses(new_hypotheses) if new_hypotheses else []
+        
+        for (i, name, source), new_hypothesis in zip(pending.values(), stored):
+            if name == "_combine":
+                results[i] = {
+                    "original_hypothesis_ids": tasks[i].get("hypothesis_ids", []),
+                    "combined_hypothesis": new_hypothesis
+                }
+            else:
+                results[i] = {
+                    "original_hypothesis_id": source["id"],
+                    "evolved_hypothesis": new_hypothesis,
+                    "technique": name
+                }
+        
+        return results
+    
     async def _evolve_hypothesis(self, hypothesis_id: str) -> Dict[str, Any]:
         """Evolve a specific hypothesis using various techniques.
         
@@ -53,29 +321,18 @@ class EvolutionAgent(BaseAgent):
             Evolution results with new hypotheses
         """
         # Get the hypothesis from context memory
-        hypotheses = self.get_from_context_memory("hypotheses", [])
-        hypothesis = next((h for h in hypotheses if h.get("id") == hypothesis_id), None)
+        hypothesis = self.get_hypothesis(hypothesis_id)
         
         if not hypothesis:
             return {"error": f"Hypothesis {hypothesis_id} not found"}
         
         # Choose a random evolution technique
         # In a real implementation, we would choose based on the hypothesis properties
-        import random
-        techniques = [
-            self._enhance_through_grounding,
-            self._improve_coherence_and_feasibility,
-            self._simplify_hypothesis,
-            self._out_of_box_thinking
-        ]
-        
-        technique = random.choice(techniques)
+        technique = _RNG.choice(self._evolution_techniques())
         evolved_hypothesis = await technique(hypothesis)
         
         # Add the evolved hypothesis to the context memory
-        if evolved_hypothesis:
-            hypotheses.append(evolved_hypothesis)
-            self.update_context_memory("hypotheses", hypotheses)
+        evolved_hypothesis = await self.add_hypothesis(evolved_hypothesis)
         
         return {
             "original_hypothesis_id": hypothesis_id,
@@ -83,6 +340,58 @@ class EvolutionAgent(BaseAgent):
             "technique": technique.__name__
         }
     
+    async def _evolve_hypothesis_all(self, hypothesis_id: str) -> Dict[str, Any]:
+        """Evolve a hypothesis with every technique concurrently.
+        
+        Args:
+            hypothesis_id: ID of the hypothesis to evolve
+            
+        Returns:
+            Evolution results with one new hypothesis per successful technique
+        """
+        hypothesis = self.get_hypothesis(hypothesis_id)
+        
+        if not hypothesis:
+            return {"error": f"Hypothesis {hypothesis_id} not found"}
+        
+        techniques = self._evolution_techniques()
+        results = await self._gather_bounded(technique(hypothesis) for technique in techniques)
+        
+        evolved_hypotheses = []
+        applied_techniques = []
+        failed_techniques = []
+        for technique, result in zip(techniques, results):
+            if isinstance(result, BaseException):
+                logger.warning("Evolution technique %s failed", technique.__name__, exc_info=result)
+                failed_techniques.append({"technique": technique.__name__, "error": str(result)})
+                continue
+            evolved_hypotheses.append(result)
+            applied_techniques.append(technique.__name__)
+        
+        # Add all evolved hypotheses to the context memory in one update
+        if evolved_hypotheses:
+            evolved_hypotheses = await self.add_hypotheses(evolved_hypotheses)
+        
+        return {
+            "original_hypothesis_id": hypothesis_id,
+            "evolved_hypotheses": evolved_hypotheses,
+            "techniques": applied_techniques,
+            "failed_techniques": failed_techniques
+        }
+    
+    def _evolution_techniques(self) -> List[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]]:
+        """Get the techniques used to evolve a single hypothesis.
+        
+        Returns:
+            List of evolution technique methods
+        """
+        return [
+            self._enhance_through_grounding,
+            self._improve_coherence_and_feasibility,
+            self._simplify_hypothesis,
+            self._out_of_box_thinking
+        ]
+    
     async def _combine_hypotheses(self, hypothesis_ids: List[str]) -> Dict[str, Any]:
         """Combine multiple hypotheses into a new one.
         
@@ -93,10 +402,7 @@ class EvolutionAgent(BaseAgent):
             Combination results with new hypothesis
         """
         # Get the hypotheses from context memory
-        all_hypotheses = self.get_from_context_memory("hypotheses", [])
-        hypotheses_to_combine = [
-            h for h in all_hypotheses if h.get("id") in hypothesis_ids
-        ]
+        hypotheses_to_combine = self.get_hypotheses(hypothesis_ids)
         
         if len(hypotheses_to_combine) < 2:
             return {"error": f"Not enough hypotheses found to combine"}
@@ -105,9 +411,7 @@ class EvolutionAgent(BaseAgent):
         combined_hypothesis = await self._combine(hypotheses_to_combine)
         
         # Add the combined hypothesis to the context memory
-        if combined_hypothesis:
-            all_hypotheses.append(combined_hypothesis)
-            self.update_context_memory("hypotheses", all_hypotheses)
+        combined_hypothesis = await self.add_hypothesis(combined_hypothesis)
         
         return {
             "original_hypothesis_ids": hypothesis_ids,
@@ -123,44 +427,44 @@ class EvolutionAgent(BaseAgent):
         Returns:
             Enhanced hypothesis
         """
-        statement = hypothesis.get("statement", "")
-        rationale = hypothesis.get("rationale", "")
-        
-        prompt = f"""
-        Enhance the following research hypothesis through grounding in literature:
-        
-        HYPOTHESIS:
-        {statement}
-        
-        RATIONALE:
-        {rationale}
-        
-        To enhance this hypothesis:
-        1. Identify any weaknesses or gaps in the hypothesis
-        2. Generate 3 search queries to find relevant literature
-        3. Simulate searching and reading articles based on these queries
-        4. Use the found information to enhance the hypothesis
-        5. Elaborate on details to fill reasoning gaps
+        prompt = self._enhance_through_grounding_prompt(hypothesis)
+        response = await self._call_model(prompt, semantic_cache=True, response_schema=EVOLVED_SCHEMA)
+        return self._enhance_through_grounding_result(hypothesis, response)
+    
+    def _enhance_through_grounding_prompt(self, hypothesis: Dict[str, Any]) -> str:
+        """Build the prompt for enhancing a hypothesis through grounding.
         
-        Provide an enhanced version with:
-        - Refined hypothesis statement
-        - Expanded rationale with literature support
-        - Improved testability based on experimental approaches found in literature
+        Args:
+            hypothesis: Hypothesis to enhance
+            
+        Returns:
+            Prompt for the model
         """
+        return _ENHANCE_TMPL.substitute(
+            statement=hypothesis.get("statement", ""),
+            rationale=hypothesis.get("rationale", "")
+        )
+    
+    def _enhance_through_grounding_result(self, hypothesis: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the enhanced hypothesis from the model response.
         
-        response = await self._call_model(prompt)
-        
-        # In a real implementation, we would parse the structured response
-        # For now, create a simple evolved hypothesis
-        evolved_hypothesis = hypothesis.copy()
-        evolved_hypothesis["id"] = str(uuid.uuid4())
-        evolved_hypothesis["parent_id"] = hypothesis["id"]
-        evolved_hypothesis["title"] = f"Enhanced: {hypothesis.get('title', 'Untitled')}"
-        evolved_hypothesis["statement"] = f"Enhanced version of the original hypothesis with literature grounding"
-        evolved_hypothesis["rationale"] = f"Expanded rationale with literature support"
-        evolved_hypothesis["generation_method"] = "evolution_enhance_grounding"
-        
-        return evolved_hypothesis
+        Args:
+            hypothesis: Hypothesis that was enhanced
+            response: Model response string
+            
+        Returns:
+            Enhanced hypothesis
+        """
+        evolved_hypothesis = {
+            "id": new_id(),
+            "parent_id": hypothesis["id"],
+            "title": f"Enhanced: {hypothesis.get('title', 'Untitled')}",
+            "statement": f"Enhanced version of hypothesis {hypothesis['id']} with literature grounding",
+            "rationale": "Expanded rationale with literature support",
+            "testability": hypothesis.get("testability", ""),
+            "generation_method": "evolution_enhance_grounding"
+        }
+        return _evolved_from(evolved_hypothesis, response)
     
     async def _improve_coherence_and_feasibility(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Improve coherence, practicality and feasibility of a hypothesis.
@@ -171,49 +475,45 @@ class EvolutionAgent(BaseAgent):
         Returns:
             Improved hypothesis
         """
-        statement = hypothesis.get("statement", "")
-        rationale = hypothesis.get("rationale", "")
-        testability = hypothesis.get("testability", "")
-        
-        prompt = f"""
-        Improve the coherence, practicality, and feasibility of the following research hypothesis:
-        
-        HYPOTHESIS:
-        {statement}
-        
-        RATIONALE:
-        {rationale}
-        
-        TESTABILITY:
-        {testability}
-        
-        To improve this hypothesis:
-        1. Identify any logical inconsistencies or unclear aspects
-        2. Make the hypothesis more coherent by clarifying relationships
-        3. Improve practicality by considering resource constraints
-        4. Enhance feasibility by suggesting more accessible experimental approaches
-        5. Address any underlying problems with potentially invalid assumptions
+        prompt = self._improve_coherence_and_feasibility_prompt(hypothesis)
+        response = await self._call_model(prompt, semantic_cache=True, response_schema=EVOLVED_SCHEMA)
+        return self._improve_coherence_and_feasibility_result(hypothesis, response)
+    
+    def _improve_coherence_and_feasibility_prompt(self, hypothesis: Dict[str, Any]) -> str:
+        """Build the prompt for improving coherence and feasibility.
         
-        Provide an improved version with:
-        - More coherent hypothesis statement
-        - Clarified rationale that addresses any inconsistencies
-        - More practical and feasible testing approach
+        Args:
+            hypothesis: Hypothesis to improve
+            
+        Returns:
+            Prompt for the model
         """
+        return _IMPROVE_TMPL.substitute(
+            statement=hypothesis.get("statement", ""),
+            rationale=hypothesis.get("rationale", ""),
+            testability=hypothesis.get("testability", "")
+        )
+    
+    def _improve_coherence_and_feasibility_result(self, hypothesis: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the improved hypothesis from the model response.
         
-        response = await self._call_model(prompt)
-        
-        # In a real implementation, we would parse the structured response
-        # For now, create a simple evolved hypothesis
-        evolved_hypothesis = hypothesis.copy()
-        evolved_hypothesis["id"] = str(uuid.uuid4())
-        evolved_hypothesis["parent_id"] = hypothesis["id"]
-        evolved_hypothesis["title"] = f"More Feasible: {hypothesis.get('title', 'Untitled')}"
-        evolved_hypothesis["statement"] = f"More coherent and feasible version of the original hypothesis"
-        evolved_hypothesis["rationale"] = f"Clarified rationale addressing inconsistencies"
-        evolved_hypothesis["testability"] = f"More practical testing approach"
-        evolved_hypothesis["generation_method"] = "evolution_improve_feasibility"
-        
-        return evolved_hypothesis
+        Args:
+            hypothesis: Hypothesis that was improved
+            response: Model response string
+            
+        Returns:
+            Improved hypothesis
+        """
+        evolved_hypothesis = {
+            "id": new_id(),
+            "parent_id": hypothesis["id"],
+            "title": f"More Feasible: {hypothesis.get('title', 'Untitled')}",
+            "statement": f"More coherent and feasible version of hypothesis {hypothesis['id']}",
+            "rationale": "Clarified rationale addressing inconsistencies",
+            "testability": "More practical testing approach",
+            "generation_method": "evolution_improve_feasibility"
+        }
+        return _evolved_from(evolved_hypothesis, response)
     
     async def _simplify_hypothesis(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Simplify a hypothesis for easier verification and testing.
@@ -224,49 +524,45 @@ class EvolutionAgent(BaseAgent):
         Returns:
             Simplified hypothesis
         """
-        statement = hypothesis.get("statement", "")
-        rationale = hypothesis.get("rationale", "")
-        testability = hypothesis.get("testability", "")
-        
-        prompt = f"""
-        Simplify the following research hypothesis for easier verification and testing:
-        
-        HYPOTHESIS:
-        {statement}
-        
-        RATIONALE:
-        {rationale}
-        
-        TESTABILITY:
-        {testability}
-        
-        To simplify this hypothesis:
-        1. Identify the core claim or relationship being proposed
-        2. Remove any unnecessary complexity or dependencies
-        3. Break down complex mechanisms into simpler components
-        4. Focus on the most essential and verifiable aspects
-        5. Simplify the testing approach to require fewer resources
+        prompt = self._simplify_hypothesis_prompt(hypothesis)
+        response = await self._call_model(prompt, semantic_cache=True, response_schema=EVOLVED_SCHEMA)
+        return self._simplify_hypothesis_result(hypothesis, response)
+    
+    def _simplify_hypothesis_prompt(self, hypothesis: Dict[str, Any]) -> str:
+        """Build the prompt for simplifying a hypothesis.
         
-        Provide a simplified version with:
-        - Clearer and more focused hypothesis statement
-        - Streamlined rationale that explains the core idea
-        - Simplified testing approach that requires fewer resources
+        Args:
+            hypothesis: Hypothesis to simplify
+            
+        Returns:
+            Prompt for the model
         """
+        return _SIMPLIFY_TMPL.substitute(
+            statement=hypothesis.get("statement", ""),
+            rationale=hypothesis.get("rationale", ""),
+            testability=hypothesis.get("testability", "")
+        )
+    
+    def _simplify_hypothesis_result(self, hypothesis: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the simplified hypothesis from the model response.
         
-        response = await self._call_model(prompt)
-        
-        # In a real implementation, we would parse the structured response
-        # For now, create a simple evolved hypothesis
-        evolved_hypothesis = hypothesis.copy()
-        evolved_hypothesis["id"] = str(uuid.uuid4())
-        evolved_hypothesis["parent_id"] = hypothesis["id"]
-        evolved_hypothesis["title"] = f"Simplified: {hypothesis.get('title', 'Untitled')}"
-        evolved_hypothesis["statement"] = f"Simplified version of the original hypothesis"
-        evolved_hypothesis["rationale"] = f"Streamlined rationale focusing on core ideas"
-        evolved_hypothesis["testability"] = f"Simplified testing approach"
-        evolved_hypothesis["generation_method"] = "evolution_simplify"
-        
-        return evolved_hypothesis
+        Args:
+            hypothesis: Hypothesis that was simplified
+            response: Model response string
+            
+        Returns:
+            Simplified hypothesis
+        """
+        evolved_hypothesis = {
+            "id": new_id(),
+            "parent_id": hypothesis["id"],
+            "title": f"Simplified: {hypothesis.get('title', 'Untitled')}",
+            "statement": f"Simplified version of hypothesis {hypothesis['id']}",
+            "rationale": "Streamlined rationale focusing on core ideas",
+            "testability": "Simplified testing approach",
+            "generation_method": "evolution_simplify"
+        }
+        return _evolved_from(evolved_hypothesis, response)
     
     async def _out_of_box_thinking(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a divergent hypothesis through out-of-box thinking.
@@ -277,47 +573,83 @@ class EvolutionAgent(BaseAgent):
         Returns:
             New divergent hypothesis
         """
-        statement = hypothesis.get("statement", "")
-        research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
-        
-        prompt = f"""
-        Generate a completely new, out-of-the-box hypothesis for the research goal, 
-        diverging from but inspired by the following hypothesis:
-        
-        RESEARCH GOAL:
-        {research_goal}
-        
-        INSPIRATION HYPOTHESIS:
-        {statement}
-        
-        To create an out-of-the-box hypothesis:
-        1. Identify the fundamental assumptions in the original hypothesis
-        2. Challenge or invert these assumptions
-        3. Apply analogies from different fields of science
-        4. Explore counterintuitive or unconventional mechanisms
-        5. Consider alternative paradigms that could explain the same phenomena
-        
-        Provide a novel, divergent hypothesis with:
-        - Bold hypothesis statement that takes a different approach
-        - Rationale explaining the unconventional thinking
-        - Testability approach for this novel perspective
-        """
+        prompt = self._out_of_box_thinking_prompt(hypothesis)
+        response = await self._call_model(prompt, semantic_cache=True, response_schema=EVOLVED_SCHEMA)
+        return self._out_of_box_thinking_result(hypothesis, response)
+    
+    def _out_of_box_thinking_prompt(self, hypothesis: Dict[str, Any]) -> str:
+        """Build the prompt for out-of-box thinking.
         
-        response = await self._call_model(prompt)
+        Args:
+            hypothesis: Source hypothesis for inspiration
+            
+        Returns:
+            Prompt for the model
+        """
+        return _OUT_OF_BOX_TMPL.substitute(
+            research_goal=self._research_goal(),
+            statement=hypothesis.get("statement", "")
+        )
+    
+    def _out_of_box_thinking_result(self, hypothesis: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the divergent hypothesis from the model response.
         
-        # In a real implementation, we would parse the structured response
-        # For now, create a simple evolved hypothesis
+        Args:
+            hypothesis: Source hypothesis for inspiration
+            response: Model response string
+            
+        Returns:
+            New divergent hypothesis
+        """
         evolved_hypothesis = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "inspiration_id": hypothesis["id"],
             "title": f"Out-of-Box: Inspired by {hypothesis.get('title', 'Untitled')}",
-            "statement": f"Novel hypothesis using out-of-box thinking",
+            "statement": f"Novel hypothesis inspired by hypothesis {hypothesis['id']} using out-of-box thinking",
             "rationale": f"Rationale explaining the unconventional approach",
             "testability": f"Testing approach for this novel perspective",
             "generation_method": "evolution_out_of_box"
         }
+        return _evolved_from(evolved_hypothesis, response)
+    
+    async def _combine_similar_hypotheses(self, num_pairs: int) -> Dict[str, Any]:
+        """Combine the most similar pairs of hypotheses.
+        
+        Candidate pairs are ranked with a single similarity matrix over the
+        hypothesis embeddings instead of comparing hypotheses pair by pair.
+        
+        Args:
+            num_pairs: Number of pairs to combine
+            
+        Returns:
+            Combination results with one new hypothesis per successful pair
+        """
+        pairs = await self._similar_hypothesis_pairs(num_pairs)
+        
+        if not pairs:
+            return {"error": f"Not enough hypotheses found to combine"}
+        
+        results = await self._gather_bounded(self._combine(list(pair)) for pair in pairs)
+        
+        combined_hypotheses = []
+        combined_ids = []
+        failed_pairs = []
+        for pair, result in zip(pairs, results):
+            if isinstance(result, BaseException):
+                logger.warning("Combining hypotheses %s failed", [h["id"] for h in pair], exc_info=result)
+                failed_pairs.append({"hypothesis_ids": [h["id"] for h in pair], "error": str(result)})
+                continue
+            combined_hypotheses.append(result)
+            combined_ids.append([h["id"] for h in pair])
         
-        return evolved_hypothesis
+        if combined_hypotheses:
+            combined_hypotheses = await self.add_hypotheses(combined_hypotheses)
+        
+        return {
+            "original_hypothesis_ids": combined_ids,
+            "combined_hypotheses": combined_hypotheses,
+            "failed_pairs": failed_pairs
+        }
     
     async def _combine(self, hypotheses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Combine multiple hypotheses into a new one.
@@ -328,49 +660,47 @@ class EvolutionAgent(BaseAgent):
         Returns:
             Combined hypothesis
         """
-        hypothesis_statements = "\n\n".join([
-            f"HYPOTHESIS {i+1}:\n{h.get('statement', '')}" 
-            for i, h in enumerate(hypotheses)
-        ])
-        
-        hypothesis_rationales = "\n\n".join([
-            f"RATIONALE {i+1}:\n{h.get('rationale', '')}" 
-            for i, h in enumerate(hypotheses)
-        ])
-        
-        prompt = f"""
-        Combine the following research hypotheses into a single, unified hypothesis:
-        
-        {hypothesis_statements}
-        
-        RATIONALES:
-        {hypothesis_rationales}
-        
-        To combine these hypotheses:
-        1. Identify the common themes and complementary aspects
-        2. Extract the strengths from each hypothesis
-        3. Create a synthesis that addresses the limitations of individual hypotheses
-        4. Develop a unified mechanism or explanation
-        5. Ensure the combined hypothesis is coherent and testable
-        
-        Provide a combined hypothesis with:
-        - Unified hypothesis statement
-        - Integrated rationale that shows how the combination improves upon individual hypotheses
-        - Comprehensive testing approach
-        """
+        prompt = self._combine_prompt(hypotheses)
+        response = await self._call_model(prompt, semantic_cache=True, response_schema=EVOLVED_SCHEMA)
+        return self._combine_result(hypotheses, response)
+    
+    def _combine_prompt(self, hypotheses: List[Dict[str, Any]]) -> str:
+        """Build the prompt for combining hypotheses.
         
-        response = await self._call_model(prompt)
+        Args:
+            hypotheses: List of hypotheses to combine
+            
+        Returns:
+            Prompt for the model
+        """
+        # Build both sections in a single pass over the hypotheses
+        statements, rationales = [], []
+        for i, h in enumerate(hypotheses, start=1):
+            statements.append(f"HYPOTHESIS {i}:\n{h.get('statement', '')}")
+            rationales.append(f"RATIONALE {i}:\n{h.get('rationale', '')}")
+        
+        return _COMBINE_TMPL.substitute(
+            hypothesis_statements="\n\n".join(statements),
+            hypothesis_rationales="\n\n".join(rationales)
+        )
+    
+    def _combine_result(self, hypotheses: List[Dict[str, Any]], response: str) -> Dict[str, Any]:
+        """Build the combined hypothesis from the model response.
         
-        # In a real implementation, we would parse the structured response
-        # For now, create a simple combined hypothesis
+        Args:
+            hypotheses: Hypotheses that were combined
+            response: Model response string
+            
+        Returns:
+            Combined hypothesis
+        """
         combined_hypothesis = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "parent_ids": [h.get("id") for h in hypotheses],
             "title": "Combined Hypothesis",
-            "statement": "Combined hypothesis statement that unifies multiple perspectives",
+            "statement": f"Combined hypothesis unifying hypotheses {', '.join(str(h.get('id')) for h in hypotheses)}",
             "rationale": "Integrated rationale showing the strengths of combination",
             "testability": "Comprehensive testing approach",
             "generation_method": "evolution_combination"
         }
-        
-        return combined_hypothesis
\ No newline at end of file
+        return _evolved_from(combined_hypothesis, response)
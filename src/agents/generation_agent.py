@@ -1,9 +1,384 @@
 """Generation agent for creating novel research hypotheses."""
 
-import uuid
-from typing import Any, Dict, List, Optional
+import logging
+import re
+import string
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
 
-from .base_agent import BaseAgent
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # pragma: no cover - optional dependency
+    ScalableBloomFilter = None
+
+from .base_agent import BaseAgent, new_id
+
+logger = logging.getLogger(__name__)
+
+# Section headers of the structured responses requested in the generation prompts
+_HDR_RE = re.compile(
+    r"^[ \t]*(SEARCH QUERIES|LITERATURE SUMMARY|FINAL HYPOTHESIS|COMBINED HYPOTHESIS|NOVEL DIRECTION"
+    r"|HYPOTHESIS|RATIONALE|TESTABILITY|IMPLICATIONS|ASSUMPTION)(?:[ \t]+\d+)?[ \t]*:",
+    re.M
+)
+# End of a paragraph that has some content: a non-empty line followed by a blank line
+_PARAGRAPH_END_RE = re.compile(r"\S[^\n]*\n[ \t]*\n")
+_AREA_RE = re.compile(r"^[ \t]*AREA[ \t]+(\d+)[ \t]+HYPOTHESES[ \t]*:", re.M)
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_BULLET_RE = re.compile(r"^[ \t]*[-*][ \t]*(.+?)[ \t]*$", re.M)
+_SUB_ASSUMPTION_RE = re.compile(r"^[ \t]*-[ \t]*Sub-assumption[^:]*:[ \t]*(.+?)[ \t]*$", re.M)
+_PLAUSIBILITY_RE = re.compile(r"^[ \t]*Plausibility assessment:[ \t]*(.+?)[ \t]*$", re.M)
+
+def _split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split a structured response into its sections in a single pass.
+    
+    Args:
+        text: Model response string
+        
+    Returns:
+        (header, body) pairs in response order, with numbers dropped from headers
+    """
+    matches = list(_HDR_RE.finditer(text))
+    return [
+        (match.group(1), text[match.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)].strip())
+        for i, match in enumerate(matches)
+    ]
+
+def _hypotheses_from_sections(sections: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Build hypotheses from a response listing several of them.
+    
+    Args:
+        sections: (header, body) pairs from _split_sections
+        
+    Returns:
+        Hypotheses in response order; empty if there is no HYPOTHESIS section
+    """
+    # Each HYPOTHESIS header starts a new hypothesis; the sections after it belong to it
+    fields = {"RATIONALE": "rationale", "TESTABILITY": "testability", "IMPLICATIONS": "implications"}
+    hypotheses: List[Dict[str, Any]] = []
+    for header, body in sections:
+        if header == "HYPOTHESIS":
+            n = len(hypotheses) + 1
+            hypotheses.append({
+                "title": f"Hypothesis {n}",
+                "statement": body or f"Statement of hypothesis {n}",
+                "rationale": f"Rationale for hypothesis {n}",
+                "testability": f"How hypothesis {n} could be tested",
+                "implications": f"Implications of hypothesis {n}"
+            })
+        elif hypotheses and header in fields and body:
+            hypotheses[-1][fields[header]] = body
+    return hypotheses
+
+def _split_areas(text: str) -> Dict[int, str]:
+    """Split a response covering several focus areas into per-area text.
+    
+    Args:
+        text: Model response string
+        
+    Returns:
+        Dictionary mapping 1-based area numbers to the text for that area
+    """
+    matches = list(_AREA_RE.finditer(text))
+    return {
+        int(match.group(1)): text[match.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)]
+        for i, match in enumerate(matches)
+    }
+
+# Statement of an expansion hypothesis whose response had no HYPOTHESIS section;
+# it is kept out of the seen-statement filter so it cannot reject later responses
+_EXPANSION_PLACEHOLDER = "Statement of hypothesis from research expansion"
+
+def _statement_key(hypothesis: Dict[str, Any]) -> str:
+    """Normalize a hypothesis statement for duplicate detection.
+    
+    Args:
+        hypothesis: Hypothesis to key
+        
+    Returns:
+        Lowercased statement with punctuation and repeated whitespace collapsed
+    """
+    return _NON_ALNUM_RE.sub(" ", hypothesis.get("statement", "").lower()).strip()
+
+def _first_sections(sections: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Get the first non-empty body of each section.
+    
+    Args:
+        sections: (header, body) pairs from _split_sections
+        
+    Returns:
+        Dictionary mapping headers to section bodies
+    """
+    first: Dict[str, str] = {}
+    for header, body in sections:
+        if body:
+            first.setdefault(header, body)
+    return first
+
+# Shared prefix of every generation prompt, sent as the system instruction so
+# providers can reuse it across calls (see BaseAgent._context_cache)
+_GOAL_TMPL = string.Template("""For the research goal:
+
+${research_goal}
+""")
+
+_FOCUS_AREAS_PROMPT = """Generate 3-5 initial focus areas for exploration, each with a brief description.
+"""
+
+_LITERATURE_PROMPT = """1. Identify 3 relevant search queries that would help explore this topic.
+2. Summarize the key findings from the literature (simulate searching and reading several papers).
+3. Based on these findings, generate a novel research hypothesis that:
+   - Builds on existing literature
+   - Addresses a gap in current knowledge
+   - Is testable and falsifiable
+   - Is aligned with the research goal
+
+Format the response as:
+SEARCH QUERIES:
+- Query 1
+- Query 2
+- Query 3
+
+LITERATURE SUMMARY:
+[Summary of key findings from relevant papers]
+
+HYPOTHESIS:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and how it builds on existing literature]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+"""
+
+_DEBATE_PROMPT = """Simulate a scientific debate among three experts with different perspectives 
+to generate a novel research hypothesis:
+
+Expert A's initial hypothesis:
+[Generate an initial hypothesis related to the research goal]
+
+Expert B's critique:
+[Critique Expert A's hypothesis, pointing out limitations or alternative interpretations]
+
+Expert C's synthesis:
+[Offer a different perspective that addresses some of Expert B's concerns]
+
+Expert A's response:
+[Defend the initial hypothesis while acknowledging valid critiques]
+
+Expert B's counter:
+[Refine the critique based on Expert A's response]
+
+Expert C's final synthesis:
+[Propose a refined hypothesis that incorporates the best elements of the debate]
+
+FINAL HYPOTHESIS:
+[Clear statement of the final hypothesis after the debate]
+
+RATIONALE:
+[Explanation of the hypothesis and how it emerged from the debate]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+"""
+
+_ASSUMPTIONS_PROMPT = """Generate a hypothesis through iterative assumptions identification:
+
+1. Identify 3-5 testable assumptions that, if proven true, would contribute to the research goal.
+2. For each assumption, identify 2-3 sub-assumptions or logical steps.
+3. Assess the plausibility of each assumption and sub-assumption.
+4. Combine the most plausible assumptions into a coherent hypothesis.
+
+Format the response as:
+
+ASSUMPTION 1:
+[Statement of assumption]
+- Sub-assumption 1.1: [Statement]
+- Sub-assumption 1.2: [Statement]
+Plausibility assessment: [High/Medium/Low]
+
+ASSUMPTION 2:
+[Statement of assumption]
+- Sub-assumption 2.1: [Statement]
+- Sub-assumption 2.2: [Statement]
+Plausibility assessment: [High/Medium/Low]
+
+[Continue for all assumptions]
+
+COMBINED HYPOTHESIS:
+[Clear statement of the combined hypothesis]
+
+RATIONALE:
+[Explanation of how the assumptions combine into a coherent hypothesis]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+"""
+
+_EXPANSION_TMPL = string.Template("""Consider the following existing hypotheses:
+
+${hypothesis_summaries}
+
+Generate a novel research hypothesis that:
+1. Explores an area not covered by existing hypotheses
+2. Addresses a different aspect of the research goal
+3. Uses a different approach or perspective
+4. Is testable and falsifiable
+
+Format the response as:
+
+NOVEL DIRECTION:
+[Describe a research direction not covered by existing hypotheses]
+
+HYPOTHESIS:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and how it differs from existing ones]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+""")
+
+_ALL_AREAS_HYPOTHESES_TMPL = string.Template("""Generate 2 novel research hypotheses for each of the following focus areas:
+
+${focus_areas}
+
+For each hypothesis, provide:
+1. A clear hypothesis statement
+2. Rationale and background
+3. How it could be tested experimentally
+4. Potential implications if proven true
+
+FORMAT (repeat for every area, numbered as above):
+
+AREA 1 HYPOTHESES:
+
+HYPOTHESIS 1:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and its background]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+
+IMPLICATIONS:
+[Potential implications if proven true]
+
+HYPOTHESIS 2:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and its background]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+
+IMPLICATIONS:
+[Potential implications if proven true]
+""")
+
+_FOCUS_AREA_HYPOTHESES_TMPL = string.Template("""Generate 2 novel research hypotheses for the following focus area:
+
+FOCUS AREA: ${area_title}
+DESCRIPTION: ${area_description}
+
+For each hypothesis, provide:
+1. A clear hypothesis statement
+2. Rationale and background
+3. How it could be tested experimentally
+4. Potential implications if proven true
+
+FORMAT:
+
+HYPOTHESIS 1:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and its background]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+
+IMPLICATIONS:
+[Potential implications if proven true]
+
+HYPOTHESIS 2:
+[Clear statement of the hypothesis]
+
+RATIONALE:
+[Explanation of the hypothesis and its background]
+
+TESTABILITY:
+[How this hypothesis could be tested experimentally]
+
+IMPLICATIONS:
+[Potential implications if proven true]
+""")
+
+class _SectionStream:
+    """Incremental tracker of the section headers in a streamed response."""
+    
+    def __init__(self):
+        """Initialize the tracker."""
+        self._chunks: List[str] = []
+        self._tail = ""
+        self.headers: List[str] = []
+        
+        # Chunk index and offset where the body of the last header starts
+        self._body_start = (0, 0)
+    
+    @property
+    def text(self) -> str:
+        """Response text received so far."""
+        return "".join(self._chunks) + self._tail
+    
+    def feed(self, chunk: str) -> None:
+        """Consume a chunk of the response, recording headers it completes.
+        
+        Only the current, possibly unfinished, line is rescanned, so the
+        response is scanned once overall.
+        
+        Args:
+            chunk: Next chunk of the response
+        """
+        self._tail += chunk
+        scanned = 0
+        for match in _HDR_RE.finditer(self._tail):
+            self.headers.append(match.group(1))
+            scanned = match.end()
+            self._body_start = (len(self._chunks), scanned)
+        
+        # Keep the unfinished last line (if it has no header yet) for the next chunk
+        cut = max(self._tail.rfind("\n") + 1, scanned)
+        self._chunks.append(self._tail[:cut])
+        self._tail = self._tail[cut:]
+    
+    def completed(self, required: Iterable[str]) -> bool:
+        """Check whether the required sections have all been fully received.
+        
+        A section is complete once the header of the next section arrives.
+        The last section received, which has no next header (e.g. TESTABILITY
+        ending the prompt formats), is complete at the end of its first
+        paragraph.
+        
+        Args:
+            required: Headers of the required sections
+            
+        Returns:
+            True if every required section is complete
+        """
+        required = set(required)
+        if required <= set(self.headers[:-1]):
+            return True
+        if not required <= set(self.headers):
+            return False
+        
+        # Only the last section is still open; rescan just its body
+        index, offset = self._body_start
+        body = "".join(self._chunks[index:])[offset:] + self._tail
+        return _PARAGRAPH_END_RE.search(body) is not None
 
 class GenerationAgent(BaseAgent):
     """Agent for generating novel research hypotheses and proposals.
@@ -13,6 +388,32 @@ class GenerationAgent(BaseAgent):
     and research expansion to generate hypotheses.
     """
     
+    # Name of the method handling each task type
+    _TASK_HANDLERS: ClassVar[Dict[str, str]] = {
+        "initial_generation": "_initial_generation",
+        "generate_hypotheses": "_generate_hypotheses",
+        "literature_exploration": "_literature_exploration",
+        "simulated_debate": "_simulated_debate",
+        "assumptions_identification": "_assumptions_identification",
+        "research_expansion": "_research_expansion"
+    }
+    
+    def __init__(self, model_config: Dict[str, Any], context_memory: Optional[Dict[str, Any]] = None):
+        """Initialize the generation agent.
+        
+        Args:
+            model_config: Configuration for the Gemini model
+            context_memory: Shared memory to store agent state and results
+        """
+        super().__init__(model_config, context_memory)
+        
+        # Normalized statements of known hypotheses, a Bloom filter when pybloom_live is installed
+        if ScalableBloomFilter is not None:
+            self._seen_statements = ScalableBloomFilter(initial_capacity=10_000, error_rate=1e-3)
+        else:
+            self._seen_statements = set()
+        self._seen_count = 0
+    
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a hypothesis generation task.
         
@@ -24,20 +425,39 @@ class GenerationAgent(BaseAgent):
         """
         task_type = task.get("task_type", "generate_hypotheses")
         
-        if task_type == "initial_generation":
-            return await self._initial_generation(task)
-        elif task_type == "generate_hypotheses":
-            return await self._generate_hypotheses(task)
-        elif task_type == "literature_exploration":
-            return await self._literature_exploration(task)
-        elif task_type == "simulated_debate":
-            return await self._simulated_debate(task)
-        elif task_type == "assumptions_identification":
-            return await self._assumptions_identification(task)
-        elif task_type == "research_expansion":
-            return await self._research_expansion(task)
-        else:
+        handler = self._TASK_HANDLERS.get(task_type)
+        if handler is None:
             return {"error": f"Unknown task type: {task_type}"}
+        return await getattr(self, handler)(task)
+    
+    async def _call_model_sections(self, prompt: str, required: Iterable[str], **kwargs) -> str:
+        """Call the model for a structured response, stopping once it is usable.
+        
+        With model_config["stream"] set, the response is streamed and the
+        stream is closed as soon as every required section is complete,
+        instead of waiting for trailing text.
+        
+        Args:
+            prompt: Instruction prompt for the model
+            required: Headers of the sections the caller parses
+            **kwargs: Additional parameters for the model call
+            
+        Returns:
+            Model response, possibly cut after the required sections
+        """
+        if not self.model_config.get("stream"):
+            return await self._call_model(prompt, **kwargs)
+        
+        sections = _SectionStream()
+        stream = self._call_model_stream(prompt, **kwargs)
+        try:
+            async for chunk in stream:
+                sections.feed(chunk)
+                if sections.completed(required):
+                    break
+        finally:
+            await stream.aclose()
+        return sections.text
     
     async def _initial_generation(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Generate initial focus areas and hypotheses for the research goal.
@@ -52,34 +472,27 @@ class GenerationAgent(BaseAgent):
         research_goal = research_plan.get("raw_goal", "")
         
         if not research_goal:
-            research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
-        
-        prompt = f"""
-        Based on the following research goal:
-        
-        {research_goal}
+            research_goal = self._research_goal()
         
-        Generate 3-5 initial focus areas for exploration, each with a brief description.
-        """
-        
-        focus_areas_response = await self._call_model(prompt)
+        focus_areas_response = await self._call_model(
+            _FOCUS_AREAS_PROMPT,
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         focus_areas = self._parse_focus_areas(focus_areas_response)
         
-        # Generate initial hypotheses for each focus area
-        hypotheses = []
-        for area in focus_areas:
-            area_hypotheses = await self._generate_hypotheses_for_focus_area(area, research_goal)
-            hypotheses.extend(area_hypotheses)
+        # Generate initial hypotheses for all focus areas in one call
+        hypotheses, failed_areas = await self._generate_hypotheses_for_all_areas(focus_areas, research_goal)
         
-        # Store in context memory
-        existing_hypotheses = self.get_from_context_memory("hypotheses", [])
-        all_hypotheses = existing_hypotheses + hypotheses
-        self.update_context_memory("hypotheses", all_hypotheses)
+        # Store in context memory and embed the new hypotheses in one batch
+        await self.add_hypotheses(hypotheses, dedupe=False)
+        await self._hypothesis_embeddings()
+        all_hypotheses = self.get_from_context_memory("hypotheses", [])
         self.update_context_memory("focus_areas", focus_areas)
         
         return {
             "focus_areas": focus_areas,
             "generated_hypotheses": hypotheses,
+            "failed_focus_areas": failed_areas,
             "hypotheses": all_hypotheses
         }
     
@@ -95,61 +508,40 @@ class GenerationAgent(BaseAgent):
         count = task.get("count", 3)
         method = task.get("method", "mixed")
         
-        hypotheses = []
+        techniques = {
+            "literature": self._literature_exploration,
+            "debate": self._simulated_debate,
+            "assumptions": self._assumptions_identification,
+            "expansion": self._research_expansion
+        }
         
-        if method == "literature":
-            # Generate hypotheses through literature exploration
-            for _ in range(count):
-                hypothesis = await self._literature_exploration({})
-                if "hypothesis" in hypothesis:
-                    hypotheses.append(hypothesis["hypothesis"])
-        
-        elif method == "debate":
-            # Generate hypotheses through simulated debates
-            for _ in range(count):
-                hypothesis = await self._simulated_debate({})
-                if "hypothesis" in hypothesis:
-                    hypotheses.append(hypothesis["hypothesis"])
-        
-        elif method == "assumptions":
-            # Generate hypotheses through assumptions identification
-            for _ in range(count):
-                hypothesis = await self._assumptions_identification({})
-                if "hypothesis" in hypothesis:
-                    hypotheses.append(hypothesis["hypothesis"])
-        
-        elif method == "expansion":
-            # Generate hypotheses through research expansion
-            for _ in range(count):
-                hypothesis = await self._research_expansion({})
-                if "hypothesis" in hypothesis:
-                    hypotheses.append(hypothesis["hypothesis"])
-        
-        else:  # mixed - use all methods
-            methods = ["literature", "debate", "assumptions", "expansion"]
-            for i in range(count):
-                method_index = i % len(methods)
-                method_name = methods[method_index]
-                
-                if method_name == "literature":
-                    hypothesis = await self._literature_exploration({})
-                elif method_name == "debate":
-                    hypothesis = await self._simulated_debate({})
-                elif method_name == "assumptions":
-                    hypothesis = await self._assumptions_identification({})
-                else:  # expansion
-                    hypothesis = await self._research_expansion({})
-                
-                if "hypothesis" in hypothesis:
-                    hypotheses.append(hypothesis["hypothesis"])
-        
-        # Store in context memory
-        existing_hypotheses = self.get_from_context_memory("hypotheses", [])
-        all_hypotheses = existing_hypotheses + hypotheses
-        self.update_context_memory("hypotheses", all_hypotheses)
+        if method in techniques:
+            calls = [techniques[method] for _ in range(count)]
+        else:  # mixed - use all methods in turn
+            methods = list(techniques.values())
+            calls = [methods[i % len(methods)] for i in range(count)]
+        
+        # Run the model calls concurrently, bounded by max_concurrency
+        results = await self._gather_bounded(call({}) for call in calls)
+        hypotheses = []
+        failed_methods = []
+        for call, result in zip(calls, results):
+            if isinstance(result, BaseException):
+                logger.warning("Generation method %s failed", call.__name__, exc_info=result)
+                failed_methods.append({"method": call.__name__, "error": str(result)})
+            elif "hypothesis" in result:
+                hypotheses.append(result["hypothesis"])
+            else:
+                failed_methods.append({"method": call.__name__, "error": result.get("error", "No hypothesis generated")})
+        
+        # Store in context memory and embed the new hypotheses in one batch
+        await self.add_hypotheses(hypotheses, dedupe=False)
+        await self._hypothesis_embeddings()
+        all_hypotheses = self.get_from_context_memory("hypotheses", [])
         
         return {
             "generated_hypotheses": hypotheses,
+            "failed_methods": failed_methods,
             "hypotheses": all_hypotheses
         }
     
@@ -162,48 +554,20 @@ class GenerationAgent(BaseAgent):
         Returns:
             Generated hypothesis
         """
-        research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
+        research_goal = self._research_goal()
         
         # In a real implementation, this would use web search to find relevant articles
         # For now, we'll simulate the process
         
-        prompt = f"""
-        For the research goal:
-        
-        {research_goal}
-        
-        1. Identify 3 relevant search queries that would help explore this topic.
-        2. Summarize the key findings from the literature (simulate searching and reading several papers).
-        3. Based on these findings, generate a novel research hypothesis that:
-           - Builds on existing literature
-           - Addresses a gap in current knowledge
-           - Is testable and falsifiable
-           - Is aligned with the research goal
-        
-        Format the response as:
-        SEARCH QUERIES:
-        - Query 1
-        - Query 2
-        - Query 3
-        
-        LITERATURE SUMMARY:
-        [Summary of key findings from relevant papers]
-        
-        HYPOTHESIS:
-        [Clear statement of the hypothesis]
-        
-        RATIONALE:
-        [Explanation of the hypothesis and how it builds on existing literature]
-        
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
-        """
-        
-        response = await self._call_model(prompt)
+        response = await self._call_model_sections(
+            _LITERATURE_PROMPT,
+            ("SEARCH QUERIES", "LITERATURE SUMMARY", "HYPOTHESIS", "RATIONALE", "TESTABILITY"),
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         
         # Parse the response and create a structured hypothesis
         hypothesis = self._parse_hypothesis_from_literature(response)
-        hypothesis["id"] = str(uuid.uuid4())
+        hypothesis["id"] = new_id()
         hypothesis["generation_method"] = "literature_exploration"
         
         return {"hypothesis": hypothesis}
@@ -217,49 +581,17 @@ class GenerationAgent(BaseAgent):
         Returns:
             Generated hypothesis
         """
-        research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
-        
-        prompt = f"""
-        For the research goal:
-        
-        {research_goal}
-        
-        Simulate a scientific debate among three experts with different perspectives 
-        to generate a novel research hypothesis:
-        
-        Expert A's initial hypothesis:
-        [Generate an initial hypothesis related to the research goal]
-        
-        Expert B's critique:
-        [Critique Expert A's hypothesis, pointing out limitations or alternative interpretations]
-        
-        Expert C's synthesis:
-        [Offer a different perspective that addresses some of Expert B's concerns]
-        
-        Expert A's response:
-        [Defend the initial hypothesis while acknowledging valid critiques]
-        
-        Expert B's counter:
-        [Refine the critique based on Expert A's response]
-        
-        Expert C's final synthesis:
-        [Propose a refined hypothesis that incorporates the best elements of the debate]
-        
-        FINAL HYPOTHESIS:
-        [Clear statement of the final hypothesis after the debate]
-        
-        RATIONALE:
-        [Explanation of the hypothesis and how it emerged from the debate]
-        
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
-        """
+        research_goal = self._research_goal()
         
-        response = await self._call_model(prompt)
+        response = await self._call_model_sections(
+            _DEBATE_PROMPT,
+            ("FINAL HYPOTHESIS", "RATIONALE", "TESTABILITY"),
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         
         # Parse the response and create a structured hypothesis
         hypothesis = self._parse_hypothesis_from_debate(response)
-        hypothesis["id"] = str(uuid.uuid4())
+        hypothesis["id"] = new_id()
         hypothesis["generation_method"] = "simulated_debate"
         
         return {"hypothesis": hypothesis}
@@ -273,51 +605,17 @@ class GenerationAgent(BaseAgent):
         Returns:
             Generated hypothesis
         """
-        research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
-        
-        prompt = f"""
-        For the research goal:
-        
-        {research_goal}
-        
-        Generate a hypothesis through iterative assumptions identification:
-        
-        1. Identify 3-5 testable assumptions that, if proven true, would contribute to the research goal.
-        2. For each assumption, identify 2-3 sub-assumptions or logical steps.
-        3. Assess the plausibility of each assumption and sub-assumption.
-        4. Combine the most plausible assumptions into a coherent hypothesis.
-        
-        Format the response as:
-        
-        ASSUMPTION 1:
-        [Statement of assumption]
-        - Sub-assumption 1.1: [Statement]
-        - Sub-assumption 1.2: [Statement]
-        Plausibility assessment: [High/Medium/Low]
-        
-        ASSUMPTION 2:
-        [Statement of assumption]
-        - Sub-assumption 2.1: [Statement]
-        - Sub-assumption 2.2: [Statement]
-        Plausibility assessment: [High/Medium/Low]
-        
-        [Continue for all assumptions]
-        
-        COMBINED HYPOTHESIS:
-        [Clear statement of the combined hypothesis]
-        
-        RATIONALE:
-        [Explanation of how the assumptions combine into a coherent hypothesis]
-        
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
-        """
+        research_goal = self._research_goal()
         
-        response = await self._call_model(prompt)
+        response = await self._call_model_sections(
+            _ASSUMPTIONS_PROMPT,
+            ("COMBINED HYPOTHESIS", "RATIONALE", "TESTABILITY"),
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         
         # Parse the response and create a structured hypothesis
         hypothesis = self._parse_hypothesis_from_assumptions(response)
-        hypothesis["id"] = str(uuid.uuid4())
+        hypothesis["id"] = new_id()
         hypothesis["generation_method"] = "assumptions_identification"
         
         return {"hypothesis": hypothesis}
@@ -331,7 +629,7 @@ class GenerationAgent(BaseAgent):
         Returns:
             Generated hypothesis
         """
-        research_goal = self.get_from_context_memory("research_plan_config", {}).get("raw_goal", "")
+        research_goal = self._research_goal()
         existing_hypotheses = self.get_from_context_memory("hypotheses", [])
         
         # Get summaries of existing hypotheses
@@ -340,44 +638,102 @@ class GenerationAgent(BaseAgent):
             for h in existing_hypotheses[:5]  # Use up to 5 existing hypotheses
         ])
         
-        prompt = f"""
-        For the research goal:
-        
-        {research_goal}
-        
-        Consider the following existing hypotheses:
-        
-        {hypothesis_summaries}
+        prompt = _EXPANSION_TMPL.substitute(hypothesis_summaries=hypothesis_summaries)
         
-        Generate a novel research hypothesis that:
-        1. Explores an area not covered by existing hypotheses
-        2. Addresses a different aspect of the research goal
-        3. Uses a different approach or perspective
-        4. Is testable and falsifiable
+        response = await self._call_model_sections(
+            prompt,
+            ("NOVEL DIRECTION", "HYPOTHESIS", "RATIONALE", "TESTABILITY"),
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         
-        Format the response as:
-        
-        NOVEL DIRECTION:
-        [Describe a research direction not covered by existing hypotheses]
+        # Parse the response and create a structured hypothesis
+        hypothesis = self._parse_hypothesis_from_expansion(response)
+        if hypothesis["statement"] != _EXPANSION_PLACEHOLDER and self._check_seen(hypothesis):
+            return {"error": "Generated hypothesis duplicates an existing one"}
+        hypothesis["id"] = new_id()
+        hypothesis["generation_method"] = "research_expansion"
         
-        HYPOTHESIS:
-        [Clear statement of the hypothesis]
+        return {"hypothesis": hypothesis}
+    
+    def _check_seen(self, hypothesis: Dict[str, Any]) -> bool:
+        """Check whether a hypothesis statement was seen before, and remember it.
         
-        RATIONALE:
-        [Explanation of the hypothesis and how it differs from existing ones]
+        The filter catches up with hypotheses added to the context memory
+        since the last check, so it covers the whole pool without rescanning it.
         
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
+        Args:
+            hypothesis: Newly generated hypothesis
+            
+        Returns:
+            True if an existing hypothesis has the same normalized statement
         """
+        hypotheses = self.get_from_context_memory("hypotheses", [])
+        if len(hypotheses) < self._seen_count:
+            self._seen_count = 0
+        for existing in hypotheses[self._seen_count:]:
+            self._seen_statements.add(_statement_key(existing))
+        self._seen_count = len(hypotheses)
+        
+        key = _statement_key(hypothesis)
+        if key in self._seen_statements:
+            return True
+        self._seen_statements.add(key)
+        return False
+    
+    async def _generate_hypotheses_for_all_areas(
+        self,
+        focus_areas: List[Dict[str, Any]],
+        research_goal: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Generate hypotheses for several focus areas with a single model call.
         
-        response = await self._call_model(prompt)
-        
-        # Parse the response and create a structured hypothesis
-        hypothesis = self._parse_hypothesis_from_expansion(response)
-        hypothesis["id"] = str(uuid.uuid4())
-        hypothesis["generation_method"] = "research_expansion"
+        Areas missing from the response, e.g. because it was truncated, are
+        generated with one call each instead.
         
-        return {"hypothesis": hypothesis}
+        Args:
+            focus_areas: Focus area information
+            research_goal: Research goal
+            
+        Returns:
+            List of generated hypotheses, and the focus areas whose fallback call failed
+        """
+        areas_text = "\n\n".join(
+            f"AREA {i}: {area.get('title', '')}\n{area.get('description', '')}"
+            for i, area in enumerate(focus_areas, 1)
+        )
+        prompt = _ALL_AREAS_HYPOTHESES_TMPL.substitute(focus_areas=areas_text)
+        response = await self._call_model(
+            prompt,
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
+        
+        by_area = _split_areas(response)
+        per_area: List[Optional[List[Dict[str, Any]]]] = []
+        for i, area in enumerate(focus_areas, 1):
+            area_hypotheses = _hypotheses_from_sections(_split_sections(by_area.get(i, "")))
+            for hypothesis in area_hypotheses:
+                hypothesis["id"] = new_id()
+                hypothesis["generation_method"] = "focus_area_exploration"
+                hypothesis["focus_area"] = area.get("title", "")
+            per_area.append(area_hypotheses or None)
+        
+        # Fall back to per-area calls for areas the response didn't cover
+        missing = [i for i, area_hypotheses in enumerate(per_area) if area_hypotheses is None]
+        failed_areas: List[Dict[str, str]] = []
+        if missing:
+            results = await self._gather_bounded(
+                self._generate_hypotheses_for_focus_area(focus_areas[i], research_goal) for i in missing
+            )
+            for i, result in zip(missing, results):
+                if isinstance(result, BaseException):
+                    title = focus_areas[i].get("title", "")
+                    logger.warning("Generating hypotheses for focus area %r failed", title, exc_info=result)
+                    failed_areas.append({"focus_area": title, "error": str(result)})
+                    result = []
+                per_area[i] = result
+        
+        hypotheses = [hypothesis for area_hypotheses in per_area for hypothesis in area_hypotheses]
+        return hypotheses, failed_areas
     
     async def _generate_hypotheses_for_focus_area(self, focus_area: Dict[str, Any], research_goal: str) -> List[Dict[str, Any]]:
         """Generate hypotheses for a specific focus area.
@@ -392,57 +748,22 @@ class GenerationAgent(BaseAgent):
         area_title = focus_area.get("title", "")
         area_description = focus_area.get("description", "")
         
-        prompt = f"""
-        For the research goal:
-        
-        {research_goal}
-        
-        Generate 2 novel research hypotheses for the following focus area:
-        
-        FOCUS AREA: {area_title}
-        DESCRIPTION: {area_description}
+        prompt = _FOCUS_AREA_HYPOTHESES_TMPL.substitute(
+            area_title=area_title,
+            area_description=area_description
+        )
         
-        For each hypothesis, provide:
-        1. A clear hypothesis statement
-        2. Rationale and background
-        3. How it could be tested experimentally
-        4. Potential implications if proven true
-        
-        FORMAT:
-        
-        HYPOTHESIS 1:
-        [Clear statement of the hypothesis]
-        
-        RATIONALE:
-        [Explanation of the hypothesis and its background]
-        
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
-        
-        IMPLICATIONS:
-        [Potential implications if proven true]
-        
-        HYPOTHESIS 2:
-        [Clear statement of the hypothesis]
-        
-        RATIONALE:
-        [Explanation of the hypothesis and its background]
-        
-        TESTABILITY:
-        [How this hypothesis could be tested experimentally]
-        
-        IMPLICATIONS:
-        [Potential implications if proven true]
-        """
-        
-        response = await self._call_model(prompt)
+        response = await self._call_model(
+            prompt,
+            system_instruction=_GOAL_TMPL.substitute(research_goal=research_goal)
+        )
         
         # Parse the response and create structured hypotheses
         hypotheses = self._parse_multiple_hypotheses(response)
         
         # Add metadata to each hypothesis
         for hypothesis in hypotheses:
-            hypothesis["id"] = str(uuid.uuid4())
+            hypothesis["id"] = new_id()
             hypothesis["generation_method"] = "focus_area_exploration"
             hypothesis["focus_area"] = area_title
         
@@ -460,9 +781,9 @@ class GenerationAgent(BaseAgent):
         # In a real implementation, this would parse the structured response
         # For now, we'll return dummy data
         return [
-            {"id": str(uuid.uuid4()), "title": "Focus Area 1", "description": "Description of focus area 1"},
-            {"id": str(uuid.uuid4()), "title": "Focus Area 2", "description": "Description of focus area 2"},
-            {"id": str(uuid.uuid4()), "title": "Focus Area 3", "description": "Description of focus area 3"},
+            {"id": new_id(), "title": "Focus Area 1", "description": "Description of focus area 1"},
+            {"id": new_id(), "title": "Focus Area 2", "description": "Description of focus area 2"},
+            {"id": new_id(), "title": "Focus Area 3", "description": "Description of focus area 3"},
         ]
     
     def _parse_hypothesis_from_literature(self, response: str) -> Dict[str, Any]:
@@ -474,16 +795,19 @@ class GenerationAgent(BaseAgent):
         Returns:
             Structured hypothesis dictionary
         """
-        # In a real implementation, this would parse the structured response
-        # For now, we'll return dummy data
-        return {
+        sections = _first_sections(_split_sections(response))
+        hypothesis = {
             "title": "Hypothesis from literature",
-            "statement": "Statement of hypothesis from literature exploration",
-            "rationale": "Rationale for the hypothesis",
-            "testability": "How this hypothesis could be tested",
-            "literature_summary": "Summary of relevant literature",
+            "statement": sections.get("HYPOTHESIS", "Statement of hypothesis from literature exploration"),
+            "rationale": sections.get("RATIONALE", "Rationale for the hypothesis"),
+            "testability": sections.get("TESTABILITY", "How this hypothesis could be tested"),
+            "literature_summary": sections.get("LITERATURE SUMMARY", "Summary of relevant literature"),
             "search_queries": ["query1", "query2", "query3"]
         }
+        queries = _BULLET_RE.findall(sections.get("SEARCH QUERIES", ""))
+        if queries:
+            hypothesis["search_queries"] = queries
+        return hypothesis
     
     def _parse_hypothesis_from_debate(self, response: str) -> Dict[str, Any]:
         """Parse hypothesis from simulated debate response.
@@ -494,14 +818,18 @@ class GenerationAgent(BaseAgent):
         Returns:
             Structured hypothesis dictionary
         """
-        # In a real implementation, this would parse the structured response
-        # For now, we'll return dummy data
+        sections = _first_sections(_split_sections(response))
+        
+        # Everything before the final hypothesis is the debate itself
+        match = _HDR_RE.search(response)
+        debate = response[:match.start()].strip() if match else ""
+        
         return {
             "title": "Hypothesis from debate",
-            "statement": "Statement of hypothesis from simulated debate",
-            "rationale": "Rationale for the hypothesis",
-            "testability": "How this hypothesis could be tested",
-            "debate_summary": "Summary of the simulated debate"
+            "statement": sections.get("FINAL HYPOTHESIS", "Statement of hypothesis from simulated debate"),
+            "rationale": sections.get("RATIONALE", "Rationale for the hypothesis"),
+            "testability": sections.get("TESTABILITY", "How this hypothesis could be tested"),
+            "debate_summary": debate or "Summary of the simulated debate"
         }
     
     def _parse_hypothesis_from_assumptions(self, response: str) -> Dict[str, Any]:
@@ -513,14 +841,26 @@ class GenerationAgent(BaseAgent):
         Returns:
             Structured hypothesis dictionary
         """
-        # In a real implementation, this would parse the structured response
-        # For now, we'll return dummy data
+        sections = _split_sections(response)
+        first = _first_sections(sections)
+        
+        assumptions = []
+        for header, body in sections:
+            if header != "ASSUMPTION" or not body:
+                continue
+            plausibility = _PLAUSIBILITY_RE.search(body)
+            assumptions.append({
+                "statement": body.splitlines()[0].strip(),
+                "sub_assumptions": _SUB_ASSUMPTION_RE.findall(body),
+                "plausibility": plausibility.group(1) if plausibility else ""
+            })
+        
         return {
             "title": "Hypothesis from assumptions",
-            "statement": "Statement of hypothesis from assumptions identification",
-            "rationale": "Rationale for the hypothesis",
-            "testability": "How this hypothesis could be tested",
-            "assumptions": [
+            "statement": first.get("COMBINED HYPOTHESIS", "Statement of hypothesis from assumptions identification"),
+            "rationale": first.get("RATIONALE", "Rationale for the hypothesis"),
+            "testability": first.get("TESTABILITY", "How this hypothesis could be tested"),
+            "assumptions": assumptions or [
                 {"statement": "Assumption 1", "sub_assumptions": ["Sub 1.1", "Sub 1.2"], "plausibility": "High"},
                 {"statement": "Assumption 2", "sub_assumptions": ["Sub 2.1", "Sub 2.2"], "plausibility": "Medium"}
             ]
@@ -535,14 +875,13 @@ class GenerationAgent(BaseAgent):
         Returns:
             Structured hypothesis dictionary
         """
-        # In a real implementation, this would parse the structured response
-        # For now, we'll return dummy data
+        sections = _first_sections(_split_sections(response))
         return {
             "title": "Hypothesis from expansion",
-            "statement": "Statement of hypothesis from research expansion",
-            "rationale": "Rationale for the hypothesis",
-            "testability": "How this hypothesis could be tested",
-            "novel_direction": "Description of the novel research direction"
+            "statement": sections.get("HYPOTHESIS", _EXPANSION_PLACEHOLDER),
+            "rationale": sections.get("RATIONALE", "Rationale for the hypothesis"),
+            "testability": sections.get("TESTABILITY", "How this hypothesis could be tested"),
+            "novel_direction": sections.get("NOVEL DIRECTION", "Description of the novel research direction")
         }
     
     def _parse_multiple_hypotheses(self, response: str) -> List[Dict[str, Any]]:
@@ -554,8 +893,11 @@ class GenerationAgent(BaseAgent):
         Returns:
             List of structured hypothesis dictionaries
         """
-        # In a real implementation, this would parse the structured response
-        # For now, we'll return dummy data
+        hypotheses = _hypotheses_from_sections(_split_sections(response))
+        if hypotheses:
+            return hypotheses
+        
+        # Fall back to placeholders if the response wasn't structured
         return [
             {
                 "title": "Hypothesis 1",
@@ -1,9 +1,109 @@
 """Proximity agent for calculating similarity between hypotheses."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - optional dependency
+    faiss = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
 
 from .base_agent import BaseAgent
 
+# FAISS scalar quantizers for the proximity index, by model_config["proximity_quantization"]
+_QUANTIZERS = {"int8": "QT_8bit", "fp16": "QT_fp16"}
+
+_prange = numba.prange if numba is not None else range
+
+def _pairwise_cosine_topk(embeddings: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the k most similar other rows for every row with explicit loops.
+    
+    Compiled with Numba when it is installed, for machines where NumPy is
+    not backed by an optimized BLAS.
+    
+    Args:
+        embeddings: L2-normalized float32 embeddings of shape (N, D)
+        k: Number of neighbors per row, at most N - 1
+        
+    Returns:
+        Similarities and row indices of the neighbors, both of shape (N, k)
+    """
+    n, d = embeddings.shape
+    top_sims = np.full((n, k), -np.inf, dtype=np.float32)
+    top_idx = np.full((n, k), -1, dtype=np.int64)
+    for i in _prange(n):
+        for j in range(n):
+            if i == j:
+                continue
+            sim = np.float32(0.0)
+            for t in range(d):
+                sim += embeddings[i, t] * embeddings[j, t]
+            if sim <= top_sims[i, k - 1]:
+                continue
+            # Insert into the row's top-k, kept sorted by descending similarity
+            pos = k - 1
+            while pos > 0 and top_sims[i, pos - 1] < sim:
+                top_sims[i, pos] = top_sims[i, pos - 1]
+                top_idx[i, pos] = top_idx[i, pos - 1]
+                pos -= 1
+            top_sims[i, pos] = sim
+            top_idx[i, pos] = j
+    return top_sims, top_idx
+
+if numba is not None:
+    _pairwise_cosine_topk = numba.njit(parallel=True, fastmath=True, cache=True)(_pairwise_cosine_topk)
+
+def _top_k_neighbors(
+    embeddings: np.ndarray,
+    k: int,
+    quantization: Optional[str] = "int8",
+    backend: str = "auto"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the k most similar other rows for every row.
+    
+    Args:
+        embeddings: L2-normalized embeddings of shape (N, D)
+        k: Number of neighbors per row, at most N - 1
+        quantization: Compression of the FAISS index ("int8", "fp16" or None)
+        backend: "auto" for FAISS if installed and NumPy otherwise, or "numba"
+        
+    Returns:
+        Similarities and row indices of the neighbors, both of shape (N, k)
+    """
+    # All backends compute in single precision
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    
+    if backend == "numba" and numba is not None:
+        return _pairwise_cosine_topk(embeddings, k)
+    
+    if faiss is not None:
+        d = embeddings.shape[1]
+        if quantization in _QUANTIZERS:
+            quantizer = getattr(faiss.ScalarQuantizer, _QUANTIZERS[quantization])
+            index = faiss.IndexScalarQuantizer(d, quantizer, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+        else:
+            index = faiss.IndexFlatIP(d)
+        index.add(embeddings)
+        # Ask for one extra neighbor since each row usually finds itself
+        sims, idx = index.search(embeddings, k + 1)
+        # Move each row's own entry to the end (stable, so order is kept) and drop it
+        order = np.argsort(idx == np.arange(len(embeddings))[:, None], axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(sims, order, axis=1), np.take_along_axis(idx, order, axis=1)
+    
+    sims = embeddings @ embeddings.T
+    np.fill_diagonal(sims, -np.inf)
+    idx = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    top_sims = np.take_along_axis(sims, idx, axis=1)
+    order = np.argsort(-top_sims, axis=1)
+    return np.take_along_axis(top_sims, order, axis=1), np.take_along_axis(idx, order, axis=1)
+
 class ProximityAgent(BaseAgent):
     """Agent for calculating similarity between research hypotheses.
     
@@ -12,6 +112,25 @@ class ProximityAgent(BaseAgent):
     showcase diverse ideas.
     """
     
+    # Name of the method handling each task type
+    _TASK_HANDLERS: ClassVar[Dict[str, str]] = {
+        "calculate_proximity": "_calculate_proximity"
+    }
+    
+    def __init__(self, model_config: Dict[str, Any], context_memory: Optional[Dict[str, Any]] = None):
+        """Initialize the proximity agent.
+        
+        Args:
+            model_config: Configuration for the Gemini model
+            context_memory: Shared memory to store agent state and results
+        """
+        super().__init__(model_config, context_memory)
+        self.backend = model_config.get("proximity_backend", "auto")
+        
+        # Compile the Numba kernel now so the first real calculation doesn't pay for it
+        if self.backend == "numba" and numba is not None:
+            _pairwise_cosine_topk(np.eye(4, 8, dtype=np.float32), 1)
+    
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a proximity task.
         
@@ -23,41 +142,43 @@ class ProximityAgent(BaseAgent):
         """
         task_type = task.get("task_type", "calculate_proximity")
         
-        if task_type == "calculate_proximity":
-            return await self._calculate_proximity()
-        else:
+        handler = self._TASK_HANDLERS.get(task_type)
+        if handler is None:
             return {"error": f"Unknown task type: {task_type}"}
+        return await getattr(self, handler)(task)
     
-    async def _calculate_proximity(self) -> Dict[str, Any]:
+    async def _calculate_proximity(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate proximity between all hypotheses.
         
+        Similarities come from one matrix product over the hypothesis
+        embeddings, and only the nearest neighbors of each hypothesis are
+        kept in the graph.
+        
+        Args:
+            task: Task parameters, optionally num_neighbors (most similar
+                hypotheses kept per hypothesis, default 10)
+            
         Returns:
             Proximity graph
         """
-        # Get all hypotheses
-        hypotheses = self.get_from_context_memory("hypotheses", [])
+        # Get all hypotheses with their embeddings
+        hypotheses, embeddings = await self._hypothesis_embeddings()
         
         if len(hypotheses) < 2:
             return {"error": "Not enough hypotheses for proximity calculation"}
         
-        # In a real implementation, we would use embeddings to calculate similarity
-        # For now, create a simple dummy graph
-        proximity_graph = {}
+        k = min(task.get("num_neighbors", 10), len(hypotheses) - 1)
+        quantization = self.model_config.get("proximity_quantization", "int8")
+        sims, idx = _top_k_neighbors(embeddings, k, quantization, self.backend)
         
+        proximity_graph = {}
         for i, h1 in enumerate(hypotheses):
-            proximity_graph[h1["id"]] = []
-            
-            for j, h2 in enumerate(hypotheses):
-                if i != j:
-                    # Simple proximity score (would be based on embeddings in real implementation)
-                    proximity = 0.5  # Dummy value
-                    
-                    proximity_graph[h1["id"]].append({
-                        "hypothesis_id": h2["id"],
-                        "similarity": proximity
-                    })
+            proximity_graph[h1["id"]] = [
+                {"hypothesis_id": hypotheses[j]["id"], "similarity": float(sim)}
+                for j, sim in zip(idx[i].tolist(), sims[i])
+            ]
         
         # Store in context memory
         self.update_context_memory("proximity_graph", proximity_graph)
         
-        return {"proximity_graph": proximity_graph}
\ No newline at end of file
+        return {"proximity_graph": proximity_graph}
@@ -1,9 +1,109 @@
 """Ranking agent for evaluating and comparing research hypotheses."""
 
+import bisect
+import logging
+import math
+import random
+import re
+import string
+from collections import deque
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # pragma: no cover - optional dependency
+    SortedList = None
+
 from .base_agent import BaseAgent
 
+logger = logging.getLogger(__name__)
+
+# Expected score of the lower-indexed player for integer rating differences
+# r2 - r1 in [-_EXPECTED_RANGE, _EXPECTED_RANGE], indexed by difference + range
+_EXPECTED_RANGE = 1000
+_EXPECTED_TABLE = 1.0 / (1.0 + 10.0 ** (np.arange(-_EXPECTED_RANGE, _EXPECTED_RANGE + 1) / 400.0))
+
+# Verdict line the match prompts ask for, e.g. "WINNER: A"; anchored to the
+# start of a line (after any markdown) so mentions of "winner" in the
+# reasoning don't count
+_WINNER_RE = re.compile(r"^[^\w\n]*WINNER\W*(?:IS\W*)?(?:HYPOTHESIS\W*)?([AB])\b", re.IGNORECASE | re.MULTILINE)
+
+# Static match instructions, sent as the system instruction so every match
+# shares a cacheable prefix; only the hypotheses pair varies per call
+_DEBATE_INSTRUCTIONS = """Compare the two research hypotheses given below through a scientific debate.
+
+DEBATE FORMAT:
+
+Round 1: Initial comparison
+- Advocate for Hypothesis A: [Present strengths of A and potential weaknesses of B]
+- Advocate for Hypothesis B: [Present strengths of B and potential weaknesses of A]
+
+Round 2: Response to critiques
+- Advocate for Hypothesis A: [Address critiques and reinforce merits]
+- Advocate for Hypothesis B: [Address critiques and reinforce merits]
+
+Round 3: Synthesis and final arguments
+- Advocate for Hypothesis A: [Final argument for why A is superior]
+- Advocate for Hypothesis B: [Final argument for why B is superior]
+
+DECISION:
+Based on the debate, which hypothesis is superior in terms of:
+1. Novelty
+2. Correctness
+3. Testability
+4. Alignment with research goal
+
+Provide a clear winner (A or B) with detailed reasoning, then end with
+a line reading "WINNER: A" or "WINNER: B".
+"""
+
+_COMPARISON_INSTRUCTIONS = """Compare the two research hypotheses given below.
+
+For each hypothesis, assess:
+1. Novelty
+2. Correctness
+3. Testability
+4. Alignment with research goal
+
+Then decide which hypothesis is superior overall. Provide a clear winner (A or B) with reasoning,
+then end with a line reading "WINNER: A" or "WINNER: B".
+"""
+
+_MATCH_TMPL = string.Template("""HYPOTHESIS A:
+${h1_statement}
+
+HYPOTHESIS B:
+${h2_statement}
+""")
+
+def _expected_scores(deltas: np.ndarray) -> np.ndarray:
+    """Get the Elo expected scores of players rated deltas points below their opponents.
+    
+    Args:
+        deltas: Opponent ratings minus player ratings
+        
+    Returns:
+        Expected scores between 0 and 1
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    in_table = (deltas == np.round(deltas)) & (np.abs(deltas) <= _EXPECTED_RANGE)
+    index = np.clip(deltas, -_EXPECTED_RANGE, _EXPECTED_RANGE).astype(np.int64) + _EXPECTED_RANGE
+    return np.where(in_table, _EXPECTED_TABLE[index], 1.0 / (1.0 + 10.0 ** (deltas / 400.0)))
+
+class _BisectList(list):
+    """Minimal stand-in for sortedcontainers.SortedList when it isn't installed."""
+    
+    def __init__(self, iterable=()):
+        super().__init__(sorted(iterable))
+    
+    def add(self, value: Any) -> None:
+        bisect.insort(self, value)
+    
+    def remove(self, value: Any) -> None:
+        del self[bisect.bisect_left(self, value)]
+
 class RankingAgent(BaseAgent):
     """Agent for ranking and comparing research hypotheses.
     
@@ -11,6 +111,42 @@ class RankingAgent(BaseAgent):
     based on pairwise comparisons through simulated scientific debates.
     """
     
+    # Rating of unrated hypotheses, and rating both sides need for a full debate
+    DEFAULT_RATING = 1200
+    DEBATE_RATING = 1300
+    
+    # Number of most recent matches kept in the tournament history
+    MAX_MATCH_HISTORY = 10_000
+    
+    # Number of recent matches whose rating changes decide convergence
+    CONVERGENCE_WINDOW = 50
+    
+    def __init__(self, model_config: Dict[str, Any], context_memory: Optional[Dict[str, Any]] = None):
+        """Initialize the ranking agent.
+        
+        Args:
+            model_config: Configuration for the Gemini model
+            context_memory: Shared memory to store agent state and results
+        """
+        super().__init__(model_config, context_memory)
+        
+        # (-rating, ID) entries kept sorted as ratings change, mirroring _ranked_ratings
+        self._ranking = (SortedList or _BisectList)()
+        self._ranked: Dict[str, float] = {}
+        self._ranked_ratings: Optional[Dict[str, float]] = None
+        
+        # Parsed verdicts keyed by (smaller ID, larger ID, match kind) -> (winner ID, response)
+        self._match_cache: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        
+        # Eligible hypotheses and the matches they need, refreshed when hypotheses or reviews change
+        self._eligible_key: Optional[Tuple[int, int, int, int]] = None
+        self._eligible_hypotheses: List[Dict[str, Any]] = []
+        self._total_possible_matches = 1
+        
+        # IDs of stored hypotheses, refreshed when the hypotheses list is written
+        self._hypothesis_ids: set = set()
+        self._hypothesis_ids_version = -1
+    
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a ranking task.
         
@@ -43,17 +179,16 @@ class RankingAgent(BaseAgent):
         tournament_state = self.get_from_context_memory("tournament_state", {})
         
         # Initialize tournament state if needed
-        if not tournament_state:
+        new_state = not tournament_state
+        if new_state:
             tournament_state = self._initialize_tournament()
         
+        # Top-level fields changed by this call, so only those are written back
+        dirty = {"progress", "top_ranked"}
+        
         # Get hypotheses that have been reviewed and passed
         hypotheses = self.get_from_context_memory("hypotheses", [])
-        reviewed = self.get_from_context_memory("reviewed_hypotheses", [])
-        
-        eligible_hypotheses = [
-            h for h in hypotheses 
-            if h.get("id") in reviewed
-        ]
+        eligible_hypotheses, total_possible_matches = self._eligible(hypotheses)
         
         if len(eligible_hypotheses) < 2:
             return {
@@ -61,40 +196,137 @@ class RankingAgent(BaseAgent):
                 "tournament_state": tournament_state
             }
         
-        # Run tournament matches
+        # Progress and convergence are measured against the current pool; new
+        # hypotheses are unranked, so both start over when the pool changes
+        if tournament_state.get("pool_size") != len(eligible_hypotheses):
+            tournament_state["pool_size"] = len(eligible_hypotheses)
+            tournament_state["completed_matches"] = 0
+            tournament_state["recent_deltas"] = deque(maxlen=self.CONVERGENCE_WINDOW)
+            dirty.update(("pool_size", "completed_matches", "recent_deltas"))
+        
+        # Ratings of the eligible hypotheses as an array, kept in sync with the ratings dict
+        ratings = tournament_state.setdefault("ratings", {})
+        num_rated = len(ratings)
+        values = self._rating_values(eligible_hypotheses, ratings)
+        if len(ratings) != num_rated:
+            dirty.add("ratings")
+        
+        # Run tournament matches, one batch of disjoint pairs at a time,
+        # until the tournament is complete or the ratings stop moving. Failed
+        # matches count toward count, so persistent API errors end the loop.
         matches = []
-        for _ in range(count):
-            # Select pair of hypotheses to compare
-            pair = self._select_hypothesis_pair(eligible_hypotheses, tournament_state)
-            if not pair:
+        failed_matches = []
+        attempted = 0
+        while attempted < count and not self._finished(tournament_state, total_possible_matches):
+            pairs = self._select_round_pairs(eligible_hypotheses, values, tournament_state, count - attempted)
+            dirty.update(("pending_pairs", "round"))
+            if not pairs:
                 break
-                
-            h1, h2 = pair
             
-            # Run the match
-            match_result = await self._run_match(h1, h2)
-            matches.append(match_result)
+            # Top-rated pairs get a full debate
+            first, second = np.array(pairs).T
+            debate = (values[first] >= self.DEBATE_RATING) & (values[second] >= self.DEBATE_RATING)
+            
+            # Pairs are disjoint, so their matches don't depend on each other's outcome
+            results = await self._gather_bounded(
+                self._run_match(eligible_hypotheses[i], eligible_hypotheses[j], bool(full))
+                for (i, j), full in zip(pairs, debate)
+            )
+            attempted += len(pairs)
             
-            # Update Elo ratings
-            self._update_elo_ratings(h1["id"], h2["id"], match_result["winner"], tournament_state)
+            # Update Elo ratings for the whole batch at once
+            played = []
+            for (i, j), result in zip(pairs, results):
+                if isinstance(result, BaseException):
+                    ids = [eligible_hypotheses[i]["id"], eligible_hypotheses[j]["id"]]
+                    logger.warning("Match between hypotheses %s failed", ids, exc_info=result)
+                    failed_matches.append({"hypothesis_ids": ids, "error": str(result)})
+                    continue
+                played.append((i, j, result))
+            if not played:
+                break
+            first, second, batch = zip(*played)
+            matches.extend(batch)
+            deltas = self._update_elo_ratings(
+                [eligible_hypotheses[i]["id"] for i in first],
+                [eligible_hypotheses[j]["id"] for j in second],
+                [result["winner"] for result in batch],
+                tournament_state
+            )
+            values[list(first)] += deltas
+            values[list(second)] -= deltas
+            tournament_state["completed_matches"] = tournament_state.get("completed_matches", 0) + len(batch)
+            dirty.update(("ratings", "faced", "matches", "recent_deltas", "completed_matches"))
         
         # Update tournament progress
-        total_possible_matches = len(eligible_hypotheses) * (len(eligible_hypotheses) - 1) / 2
-        completed_matches = tournament_state.get("completed_matches", 0) + len(matches)
-        tournament_state["completed_matches"] = completed_matches
-        tournament_state["progress"] = min(1.0, completed_matches / max(1, total_possible_matches))
+        completed_matches = tournament_state.get("completed_matches", 0)
+        tournament_state["progress"] = min(1.0, completed_matches / total_possible_matches)
         
         # Update top ranked hypotheses
         tournament_state["top_ranked"] = self._get_top_ranked(tournament_state, hypotheses)
         
         # Save updated tournament state
-        self.update_context_memory("tournament_state", tournament_state)
+        if new_state:
+            self.update_context_memory("tournament_state", tournament_state)
+        else:
+            self.update_context_memory_delta("tournament_state", {key: tournament_state[key] for key in dirty})
         
         return {
             "matches": matches,
+            "failed_matches": failed_matches,
             "tournament_state": tournament_state
         }
     
+    def _eligible(self, hypotheses: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Get the reviewed hypotheses and the number of matches needed to rank them.
+        
+        Both are recomputed only when the hypotheses or reviewed lists were
+        written or changed length since the last call.
+        
+        Args:
+            hypotheses: List of all hypotheses
+            
+        Returns:
+            Eligible hypotheses and the total number of tournament matches
+        """
+        reviewed = self.get_from_context_memory("reviewed_hypotheses", [])
+        key = (
+            self.context_memory.version("hypotheses"),
+            self.context_memory.version("reviewed_hypotheses"),
+            len(hypotheses),
+            len(reviewed)
+        )
+        if key != self._eligible_key:
+            reviewed_ids = set(reviewed)
+            self._eligible_hypotheses = [h for h in hypotheses if h.get("id") in reviewed_ids]
+            
+            # A Swiss tournament needs ceil(log2 N) rounds of N/2 matches
+            n = len(self._eligible_hypotheses)
+            self._total_possible_matches = max(1, math.ceil(math.log2(n)) * (n // 2)) if n else 1
+            self._eligible_key = key
+        return self._eligible_hypotheses, self._total_possible_matches
+    
+    def _finished(self, tournament_state: Dict[str, Any], total_possible_matches: int) -> bool:
+        """Check whether more matches would add little ranking information.
+        
+        The tournament is finished once it has played all its Swiss rounds
+        for the current pool, or once the mean rating change over the last CONVERGENCE_WINDOW
+        matches is below model_config["elo_convergence_threshold"]
+        (default 2.0 points).
+        
+        Args:
+            tournament_state: Current tournament state
+            total_possible_matches: Matches needed to rank the eligible hypotheses
+            
+        Returns:
+            True if no more matches should be run
+        """
+        if tournament_state.get("completed_matches", 0) >= total_possible_matches:
+            return True
+        recent = tournament_state.get("recent_deltas") or ()
+        threshold = self.model_config.get("elo_convergence_threshold", 2.0)
+        return len(recent) >= self.CONVERGENCE_WINDOW and sum(recent) / len(recent) < threshold
+    
     async def _update_rankings(self) -> Dict[str, Any]:
         """Update hypothesis rankings based on current tournament state.
         
@@ -107,8 +339,8 @@ class RankingAgent(BaseAgent):
         # Update top ranked hypotheses
         tournament_state["top_ranked"] = self._get_top_ranked(tournament_state, hypotheses)
         
-        # Save updated tournament state
-        self.update_context_memory("tournament_state", tournament_state)
+        # Save the updated ranking only
+        self.update_context_memory_delta("tournament_state", {"top_ranked": tournament_state["top_ranked"]})
         
         return {"tournament_state": tournament_state}
     
@@ -120,66 +352,151 @@ class RankingAgent(BaseAgent):
         """
         return {
             "ratings": {},  # Hypothesis ID -> Elo rating
-            "matches": [],  # List of completed matches
-            "completed_matches": 0,
+            "matches": deque(maxlen=self.MAX_MATCH_HISTORY),  # Most recent completed matches
+            "faced": {},  # Hypothesis ID -> IDs of opponents it has played
+            "round": 0,  # Number of Swiss rounds paired so far
+            "pending_pairs": [],  # Pairs of the current round not yet played
+            "pool_size": 0,  # Number of eligible hypotheses the counters below refer to
+            "completed_matches": 0,  # Matches played since the pool last changed
+            "recent_deltas": deque(maxlen=self.CONVERGENCE_WINDOW),  # Absolute rating changes of recent matches
             "progress": 0.0,
             "top_ranked": []
         }
     
-    def _select_hypothesis_pair(
+    def _rating_values(self, hypotheses: List[Dict[str, Any]], ratings: Dict[str, float]) -> np.ndarray:
+        """Get the ratings of hypotheses as an array, rating unrated ones first.
+        
+        Args:
+            hypotheses: Hypotheses to get ratings for
+            ratings: Hypothesis ID -> Elo rating, updated in place
+            
+        Returns:
+            Array of ratings aligned with hypotheses
+        """
+        values = np.fromiter(
+            (ratings.get(h["id"], np.nan) for h in hypotheses),
+            dtype=np.float64,
+            count=len(hypotheses)
+        )
+        missing = np.flatnonzero(np.isnan(values))
+        values[missing] = self.DEFAULT_RATING
+        for i in missing:
+            ratings[hypotheses[i]["id"]] = self.DEFAULT_RATING
+        return values
+    
+    def _select_round_pairs(
         self, 
         hypotheses: List[Dict[str, Any]], 
-        tournament_state: Dict[str, Any]
-    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
-        """Select a pair of hypotheses to compare.
+        values: np.ndarray,
+        tournament_state: Dict[str, Any],
+        count: int
+    ) -> List[Tuple[int, int]]:
+        """Select disjoint pairs of hypotheses to compare.
+        
+        Pairs come from Swiss-style rounds: each round pairs every eligible
+        hypothesis once with a close-rated opponent it hasn't faced, so
+        ranking N hypotheses takes about N/2 * log2(N) matches instead of a
+        full round-robin. All returned pairs belong to the same round.
         
         Args:
             hypotheses: List of eligible hypotheses
+            values: Ratings aligned with hypotheses
             tournament_state: Current tournament state
+            count: Maximum number of pairs
             
         Returns:
-            Tuple of two hypotheses to compare, or None if no suitable pair
+            Pairs of indices into hypotheses, empty if there is no suitable pair
         """
-        # This is a simplified implementation
-        # A real implementation would use the proximity graph and prioritize
-        # newer and top-ranking hypotheses
-        
-        # Initialize ratings for hypotheses that don't have one
-        ratings = tournament_state.get("ratings", {})
-        default_rating = 1200
-        
-        for h in hypotheses:
-            if h["id"] not in ratings:
-                ratings[h["id"]] = default_rating
-        
-        # Simple selection: pick the first two hypotheses
-        # In a real implementation, this would be more sophisticated
-        if len(hypotheses) >= 2:
-            return hypotheses[0], hypotheses[1]
+        if len(hypotheses) < 2:
+            return []
+        
+        index = {h["id"]: i for i, h in enumerate(hypotheses)}
+        pending = tournament_state.setdefault("pending_pairs", [])
+        if not pending:
+            # The round is over, pair the next one
+            pending.extend(self._swiss_pairs(hypotheses, values, tournament_state.setdefault("faced", {})))
+            tournament_state["round"] = tournament_state.get("round", 0) + 1
+        
+        # Skip self-pairs and pairs whose hypotheses are no longer eligible
+        pairs = [
+            (index[h1_id], index[h2_id]) for h1_id, h2_id in pending[:count]
+            if h1_id != h2_id and h1_id in index and h2_id in index
+        ]
+        del pending[:count]
+        return pairs
+    
+    def _swiss_pairs(
+        self,
+        hypotheses: List[Dict[str, Any]],
+        values: np.ndarray,
+        faced: Dict[str, List[str]]
+    ) -> List[List[str]]:
+        """Pair hypotheses for one Swiss round.
+        
+        Walking down the ranking, each unpaired hypothesis is paired with the
+        nearest-ranked unpaired one it hasn't faced, so each pair is found by
+        a short local scan of the sorted list. Hypotheses that have already
+        faced every remaining candidate are paired with the nearest one
+        anyway. With an odd count, the lowest-rated of the hypotheses that
+        played the most sits the round out. If model_config["max_rating_gap"]
+        is set, hypotheses are never paired across a larger rating gap and
+        sit the round out instead.
         
-        return None
+        Args:
+            hypotheses: List of eligible hypotheses
+            values: Ratings aligned with hypotheses
+            faced: Hypothesis ID -> IDs of opponents it has played
+            
+        Returns:
+            List of [ID, ID] pairs
+        """
+        # A hypothesis stored twice under the same ID must not be paired with itself
+        order = np.argsort(-values, kind="stable")
+        rated = dict(zip((hypotheses[i]["id"] for i in order), values[order].tolist()))
+        if len(rated) % 2:
+            bye = max(reversed(list(rated)), key=lambda h_id: len(faced.get(h_id, ())))
+            del rated[bye]
+        ranked = list(rated)
+        ratings = list(rated.values())
+        max_gap = self.model_config.get("max_rating_gap")
+        
+        pairs = []
+        paired = [False] * len(ranked)
+        for i, first in enumerate(ranked):
+            if paired[i]:
+                continue
+            played = set(faced.get(first, ()))
+            nearest = partner = None
+            for j in range(i + 1, len(ranked)):
+                if paired[j]:
+                    continue
+                if max_gap is not None and ratings[i] - ratings[j] > max_gap:
+                    break  # Sorted, so every later candidate is even further away
+                if nearest is None:
+                    nearest = j
+                if ranked[j] not in played:
+                    partner = j
+                    break
+            partner = nearest if partner is None else partner
+            if partner is not None:
+                paired[i] = paired[partner] = True
+                pairs.append([first, ranked[partner]])
+        return pairs
     
-    async def _run_match(self, h1: Dict[str, Any], h2: Dict[str, Any]) -> Dict[str, Any]:
+    async def _run_match(self, h1: Dict[str, Any], h2: Dict[str, Any], debate: bool) -> Dict[str, Any]:
         """Run a tournament match between two hypotheses.
         
         Args:
             h1: First hypothesis
             h2: Second hypothesis
+            debate: Whether both are rated highly enough for a full debate
             
         Returns:
             Match result
         """
         # For top hypotheses, use multi-turn scientific debate
         # For lower-ranked, use single-turn comparison
-        
-        # Use ratings to determine if this should be a detailed debate
-        tournament_state = self.get_from_context_memory("tournament_state", {})
-        ratings = tournament_state.get("ratings", {})
-        
-        h1_rating = ratings.get(h1["id"], 1200)
-        h2_rating = ratings.get(h2["id"], 1200)
-        
-        if h1_rating >= 1300 and h2_rating >= 1300:
+        if debate:
             return await self._run_scientific_debate(h1, h2)
         else:
             return await self._run_simple_comparison(h1, h2)
@@ -194,53 +511,12 @@ class RankingAgent(BaseAgent):
         Returns:
             Debate result
         """
-        h1_statement = h1.get("statement", "")
-        h2_statement = h2.get("statement", "")
-        
-        prompt = f"""
-        Compare the following two research hypotheses through a scientific debate:
-        
-        HYPOTHESIS A:
-        {h1_statement}
-        
-        HYPOTHESIS B:
-        {h2_statement}
-        
-        DEBATE FORMAT:
-        
-        Round 1: Initial comparison
-        - Advocate for Hypothesis A: [Present strengths of A and potential weaknesses of B]
-        - Advocate for Hypothesis B: [Present strengths of B and potential weaknesses of A]
-        
-        Round 2: Response to critiques
-        - Advocate for Hypothesis A: [Address critiques and reinforce merits]
-        - Advocate for Hypothesis B: [Address critiques and reinforce merits]
-        
-        Round 3: Synthesis and final arguments
-        - Advocate for Hypothesis A: [Final argument for why A is superior]
-        - Advocate for Hypothesis B: [Final argument for why B is superior]
-        
-        DECISION:
-        Based on the debate, which hypothesis is superior in terms of:
-        1. Novelty
-        2. Correctness
-        3. Testability
-        4. Alignment with research goal
-        
-        Provide a clear winner (A or B) with detailed reasoning.
-        """
-        
-        response = await self._call_model(prompt)
-        
-        # In a real implementation, parse the structured debate result
-        # For now, randomly select a winner
-        import random
-        winner = random.choice([h1["id"], h2["id"]])
+        winner, response = await self._judge("debate", h1, h2, _DEBATE_INSTRUCTIONS)
         
         return {
             "hypothesis_1": h1["id"],
             "hypothesis_2": h2["id"],
-            "debate_summary": f"Model response to: {prompt[:30]}...",
+            "debate_summary": response,
             "winner": winner,
             "reasoning": "Reasoning for the winner selection"
         }
@@ -255,96 +531,119 @@ class RankingAgent(BaseAgent):
         Returns:
             Comparison result
         """
-        h1_statement = h1.get("statement", "")
-        h2_statement = h2.get("statement", "")
-        
-        prompt = f"""
-        Compare the following two research hypotheses:
-        
-        HYPOTHESIS A:
-        {h1_statement}
-        
-        HYPOTHESIS B:
-        {h2_statement}
-        
-        For each hypothesis, assess:
-        1. Novelty
-        2. Correctness
-        3. Testability
-        4. Alignment with research goal
-        
-        Then decide which hypothesis is superior overall. Provide a clear winner (A or B) with reasoning.
-        """
-        
-        response = await self._call_model(prompt)
-        
-        # In a real implementation, parse the structured comparison result
-        # For now, randomly select a winner
-        import random
-        winner = random.choice([h1["id"], h2["id"]])
+        winner, response = await self._judge("comparison", h1, h2, _COMPARISON_INSTRUCTIONS)
         
         return {
             "hypothesis_1": h1["id"],
             "hypothesis_2": h2["id"],
-            "comparison_summary": f"Model response to: {prompt[:30]}...",
+            "comparison_summary": response,
             "winner": winner,
             "reasoning": "Reasoning for the winner selection"
         }
     
+    async def _judge(self, kind: str, h1: Dict[str, Any], h2: Dict[str, Any], instructions: str) -> Tuple[str, str]:
+        """Get the model's verdict on a match, reusing an earlier verdict on the same pair.
+        
+        Verdicts are cached regardless of which hypothesis was presented
+        first. Responses without a parsable verdict fall back to a random
+        winner and are not cached.
+        
+        Args:
+            kind: Kind of match, part of the cache key
+            h1: Hypothesis presented as A
+            h2: Hypothesis presented as B
+            instructions: Static match instructions
+            
+        Returns:
+            Winner ID and model response
+        """
+        key = (min(h1["id"], h2["id"]), max(h1["id"], h2["id"]), kind)
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        prompt = _MATCH_TMPL.substitute(h1_statement=h1.get("statement", ""), h2_statement=h2.get("statement", ""))
+        response = await self._call_model(prompt, system_instruction=instructions)
+        
+        # The verdict line comes last, so prefer the last one if several appear
+        verdicts = _WINNER_RE.findall(response)
+        if not verdicts:
+            return random.choice([h1["id"], h2["id"]]), response
+        
+        verdict = (h1["id"] if verdicts[-1].upper() == "A" else h2["id"], response)
+        self._match_cache[key] = verdict
+        return verdict
+    
     def _update_elo_ratings(
         self, 
-        h1_id: str, 
-        h2_id: str, 
-        winner_id: str, 
+        h1_ids: List[str], 
+        h2_ids: List[str], 
+        winner_ids: List[str], 
         tournament_state: Dict[str, Any]
-    ) -> None:
-        """Update Elo ratings based on match result.
+    ) -> np.ndarray:
+        """Update Elo ratings based on the results of a batch of disjoint matches.
         
         Args:
-            h1_id: ID of first hypothesis
-            h2_id: ID of second hypothesis
-            winner_id: ID of the winning hypothesis
+            h1_ids: IDs of the first hypothesis of each match
+            h2_ids: IDs of the second hypothesis of each match
+            winner_ids: ID of the winning hypothesis of each match
             tournament_state: Current tournament state
+            
+        Returns:
+            Rating change of each first hypothesis; each second one changed by the negation
         """
         ratings = tournament_state.get("ratings", {})
         
-        # Ensure both hypotheses have ratings
-        if h1_id not in ratings:
-            ratings[h1_id] = 1200
-        if h2_id not in ratings:
-            ratings[h2_id] = 1200
+        # Ensure all hypotheses have ratings
+        for h_id in (*h1_ids, *h2_ids):
+            if h_id not in ratings:
+                ratings[h_id] = self.DEFAULT_RATING
         
         # Calculate Elo rating updates
         k_factor = 32  # Standard K-factor
         
         # Get current ratings
-        r1 = ratings[h1_id]
-        r2 = ratings[h2_id]
+        r1 = np.array([ratings[h_id] for h_id in h1_ids], dtype=np.float64)
+        r2 = np.array([ratings[h_id] for h_id in h2_ids], dtype=np.float64)
         
-        # Calculate expected scores
-        e1 = 1 / (1 + 10 ** ((r2 - r1) / 400))
-        e2 = 1 / (1 + 10 ** ((r1 - r2) / 400))
+        # Expected and actual scores of the first hypotheses; the second's are 1 - e1 and 1 - s1
+        e1 = _expected_scores(r2 - r1)
+        s1 = np.array([winner == h_id for winner, h_id in zip(winner_ids, h1_ids)], dtype=np.float64)
         
-        # Calculate actual scores
-        s1 = 1 if winner_id == h1_id else 0
-        s2 = 1 if winner_id == h2_id else 0
-        
-        # Update ratings
-        ratings[h1_id] = round(r1 + k_factor * (s1 - e1))
-        ratings[h2_id] = round(r2 + k_factor * (s2 - e2))
+        # Update ratings; Elo is zero-sum, so the second hypothesis loses what the first gains
+        deltas = np.round(k_factor * (s1 - e1))
+        for h1_id, h2_id, delta in zip(h1_ids, h2_ids, deltas.astype(int).tolist()):
+            self._set_rating(ratings, h1_id, ratings[h1_id] + delta)
+            self._set_rating(ratings, h2_id, ratings[h2_id] - delta)
         
         # Update tournament state
         tournament_state["ratings"] = ratings
-        
-        # Add match to history
-        matches = tournament_state.get("matches", [])
-        matches.append({
-            "hypothesis_1": h1_id,
-            "hypothesis_2": h2_id,
-            "winner": winner_id,
-            "timestamp": "2025-03-07"  # In a real implementation, use actual timestamp
-        })
+        recent = tournament_state.get("recent_deltas")
+        if not isinstance(recent, deque):
+            recent = deque(recent or (), maxlen=self.CONVERGENCE_WINDOW)
+        recent.extend(np.abs(deltas).tolist())
+        tournament_state["recent_deltas"] = recent
+        faced = tournament_state.setdefault("faced", {})
+        for h1_id, h2_id in zip(h1_ids, h2_ids):
+            faced.setdefault(h1_id, []).append(h2_id)
+            faced.setdefault(h2_id, []).append(h1_id)
+        
+        # Add matches to history, dropping the oldest beyond MAX_MATCH_HISTORY
+        matches = tournament_state.get("matches")
+        if not isinstance(matches, deque):
+            # Stores that serialize values hand the history back as a list
+            matches = deque(matches or (), maxlen=self.MAX_MATCH_HISTORY)
+        matches.extend(
+            {
+                "hypothesis_1": h1_id,
+                "hypothesis_2": h2_id,
+                "winner": winner_id,
+                "timestamp": "2025-03-07"  # In a real implementation, use actual timestamp
+            }
+            for h1_id, h2_id, winner_id in zip(h1_ids, h2_ids, winner_ids)
+        )
         tournament_state["matches"] = matches
+        return deltas
     
     def _get_top_ranked(
         self, 
@@ -360,13 +659,51 @@ class RankingAgent(BaseAgent):
         Returns:
             List of hypothesis IDs sorted by rating
         """
-        ratings = tournament_state.get("ratings", {})
+        ranking = self._ranking_for(tournament_state.get("ratings", {}))
         
         # Filter to only include hypotheses that exist
-        hypothesis_ids = {h["id"] for h in hypotheses}
-        valid_ratings = {h_id: rating for h_id, rating in ratings.items() if h_id in hypothesis_ids}
+        version = self.context_memory.version("hypotheses")
+        if version != self._hypothesis_ids_version or len(self._hypothesis_ids) != len(hypotheses):
+            self._hypothesis_ids = {h["id"] for h in hypotheses}
+            self._hypothesis_ids_version = version
+        
+        # The ranking is already sorted by rating (descending)
+        return [h_id for _, h_id in ranking if h_id in self._hypothesis_ids]
+    
+    def _ranking_for(self, ratings: Dict[str, float]) -> Any:
+        """Get the sorted (-rating, ID) index of a ratings dict.
         
-        # Sort by rating (descending)
-        sorted_ids = sorted(valid_ratings.keys(), key=lambda h_id: valid_ratings[h_id], reverse=True)
+        The index is updated incrementally by _set_rating. It is rebuilt
+        when ratings is a different dict, e.g. one loaded from a shared
+        store, and extended with hypotheses that were given a rating since.
         
-        return sorted_ids
\ No newline at end of file
+        Args:
+            ratings: Hypothesis ID -> Elo rating
+            
+        Returns:
+            Sorted list of (-rating, ID) entries
+        """
+        if ratings is not self._ranked_ratings:
+            self._ranked = dict(ratings)
+            self._ranking = (SortedList or _BisectList)((-rating, h_id) for h_id, rating in ratings.items())
+            self._ranked_ratings = ratings
+        elif len(self._ranked) != len(ratings):
+            for h_id, rating in ratings.items():
+                if h_id not in self._ranked:
+                    self._ranked[h_id] = rating
+                    self._ranking.add((-rating, h_id))
+        return self._ranking
+    
+    def _set_rating(self, ratings: Dict[str, float], h_id: str, rating: float) -> None:
+        """Set a hypothesis rating and move it in the sorted index.
+        
+        Args:
+            ratings: Hypothesis ID -> Elo rating
+            h_id: ID of the hypothesis
+            rating: New rating
+        """
+        ranking = self._ranking_for(ratings)
+        ranking.remove((-self._ranked[h_id], h_id))
+        ranking.add((-rating, h_id))
+        self._ranked[h_id] = rating
+        ratings[h_id] = rating
\ No newline at end of file
@@ -1,9 +1,48 @@
 """Reflection agent for reviewing research hypotheses."""
 
-from typing import Any, Dict, List, Optional
+import functools
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from .base_agent import BaseAgent
 
+_ReviewMethod = Callable[[Any, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+def _memoize_by_statement(review_type: str) -> Callable[[_ReviewMethod], _ReviewMethod]:
+    """Cache the results of a review method by hypothesis statement.
+    
+    Hypotheses that are re-proposed with the same statement reuse the
+    earlier review instead of calling the model again.
+    
+    Args:
+        review_type: Name of the review, part of the cache key
+        
+    Returns:
+        Decorator for ReflectionAgent review methods
+    """
+    def decorator(method: _ReviewMethod) -> _ReviewMethod:
+        @functools.wraps(method)
+        async def wrapper(self: "ReflectionAgent", hypothesis: Dict[str, Any]) -> Dict[str, Any]:
+            statement_hash = hashlib.blake2b(hypothesis.get("statement", "").encode(), digest_size=16).hexdigest()
+            key = f"{review_type}:{statement_hash}"
+            cache = self._get_review_cache()
+            if key not in cache:
+                cache[key] = await method(self, hypothesis)
+                self._review_cache_dirty = True
+            return cache[key]
+        return wrapper
+    return decorator
+
+def _review_or_error(result: Any) -> Dict[str, Any]:
+    """Turn an exception raised by a review into an errored, not passed, review."""
+    if isinstance(result, BaseException):
+        return {"error": str(result), "passed": False}
+    return result
+
+def _errored(review: Dict[str, Any]) -> bool:
+    """Check whether a review could not be completed, as opposed to failing."""
+    return "error" in review
+
 class ReflectionAgent(BaseAgent):
     """Agent for reviewing and critiquing research hypotheses.
     
@@ -16,6 +55,19 @@ class ReflectionAgent(BaseAgent):
     - Recurrent/tournament review
     """
     
+    def __init__(self, model_config: Dict[str, Any], context_memory: Optional[Dict[str, Any]] = None):
+        """Initialize the reflection agent.
+        
+        Args:
+            model_config: Configuration for the Gemini model
+            context_memory: Shared memory to store agent state and results
+        """
+        super().__init__(model_config, context_memory)
+        
+        # Review results keyed by "review_type:statement_hash", persisted as context_memory["review_cache"]
+        self._review_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._review_cache_dirty = False
+    
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a review task.
         
@@ -33,9 +85,41 @@ class ReflectionAgent(BaseAgent):
                 return {"error": "Missing hypothesis_id"}
                 
             return await self._review_hypothesis(hypothesis_id)
+        elif task_type == "review_hypotheses":
+            reviews = await self._review_hypotheses(task.get("hypothesis_ids", []))
+            return {"reviews": reviews}
         else:
             return {"error": f"Unknown task type: {task_type}"}
     
+    async def execute_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several review tasks, reviewing all their hypotheses together.
+        
+        Args:
+            tasks: Review tasks
+            
+        Returns:
+            Review results in task order
+        """
+        hypothesis_ids = []
+        for task in tasks:
+            task_type = task.get("task_type", "review_hypothesis")
+            if task_type == "review_hypothesis" and task.get("hypothesis_id"):
+                hypothesis_ids.append(task["hypothesis_id"])
+            elif task_type == "review_hypotheses":
+                hypothesis_ids.extend(task.get("hypothesis_ids", []))
+        reviews = dict(zip(hypothesis_ids, await self._review_hypotheses(hypothesis_ids)))
+        
+        results = []
+        for task in tasks:
+            task_type = task.get("task_type", "review_hypothesis")
+            if task_type == "review_hypothesis" and task.get("hypothesis_id"):
+                results.append(reviews[task["hypothesis_id"]])
+            elif task_type == "review_hypotheses":
+                results.append({"reviews": [reviews[h_id] for h_id in task.get("hypothesis_ids", [])]})
+            else:
+                results.append(await self.execute(task))
+        return results
+    
     async def _review_hypothesis(self, hypothesis_id: str) -> Dict[str, Any]:
         """Review a specific hypothesis.
         
@@ -45,44 +129,95 @@ class ReflectionAgent(BaseAgent):
         Returns:
             Review results
         """
-        # Get the hypothesis from context memory
-        hypotheses = self.get_from_context_memory("hypotheses", [])
-        hypothesis = next((h for h in hypotheses if h.get("id") == hypothesis_id), None)
-        
-        if not hypothesis:
-            return {"error": f"Hypothesis {hypothesis_id} not found"}
+        return (await self._review_hypotheses([hypothesis_id]))[0]
+    
+    async def _review_hypotheses(self, hypothesis_ids: List[str]) -> List[Dict[str, Any]]:
+        """Review several hypotheses in two concurrent waves.
         
-        # Perform initial review
-        initial_review = await self._perform_initial_review(hypothesis)
+        All initial reviews run concurrently first; the full, deep
+        verification and observation reviews of every hypothesis that passed
+        then run concurrently as a second wave, bounded by max_concurrency.
         
-        # If initial review passes, perform full review
-        if initial_review.get("passed", False):
-            full_review = await self._perform_full_review(hypothesis)
-            deep_verification = await self._perform_deep_verification(hypothesis)
-            observation_review = await self._perform_observation_review(hypothesis)
+        Args:
+            hypothesis_ids: IDs of the hypotheses to review
             
-            review_results = {
-                "hypothesis_id": hypothesis_id,
-                "initial_review": initial_review,
+        Returns:
+            Review results in the order of hypothesis_ids
+        """
+        # Get the hypotheses from context memory
+        hypotheses = {h_id: self.get_hypothesis(h_id) for h_id in dict.fromkeys(hypothesis_ids)}
+        found = [h for h in hypotheses.values() if h]
+        
+        # Perform initial reviews; a failed review counts as not passed
+        initial_reviews = {
+            h["id"]: _review_or_error(result)
+            for h, result in zip(found, await self._gather_bounded(self._perform_initial_review(h) for h in found))
+        }
+        
+        # The remaining reviews of passing hypotheses are independent, so run them all concurrently
+        passing = [h for h in found if initial_reviews[h["id"]].get("passed", False)]
+        follow_ups = await self._gather_bounded(
+            review(h)
+            for h in passing
+            for review in (self._perform_full_review, self._perform_deep_verification, self._perform_observation_review)
+        )
+        
+        results = {
+            h["id"]: {"hypothesis_id": h["id"], "initial_review": initial_reviews[h["id"]], "passed": False}
+            for h in found
+        }
+        for i, h in enumerate(passing):
+            full_review, deep_verification, observation_review = map(_review_or_error, follow_ups[3 * i:3 * i + 3])
+            results[h["id"]].update({
                 "full_review": full_review,
                 "deep_verification": deep_verification,
                 "observation_review": observation_review,
                 "passed": full_review.get("passed", False) and deep_verification.get("passed", False)
-            }
-        else:
-            review_results = {
-                "hypothesis_id": hypothesis_id,
-                "initial_review": initial_review,
-                "passed": False
-            }
-        
-        # Update reviewed hypotheses in context memory
-        reviewed = self.get_from_context_memory("reviewed_hypotheses", [])
-        reviewed.append(hypothesis_id)
-        self.update_context_memory("reviewed_hypotheses", reviewed)
-        
-        return review_results
+            })
+        
+        # A review that raised (e.g. a timeout) is not a verdict; such hypotheses
+        # are reported as errors and left unreviewed so they are queued again
+        errored = set()
+        for h_id, result in results.items():
+            failures = [
+                result[name]["error"]
+                for name in ("initial_review", "full_review", "deep_verification", "observation_review")
+                if name in result and _errored(result[name])
+            ]
+            if failures:
+                result["error"] = f"Review incomplete: {failures[0]}"
+                errored.add(h_id)
+        
+        # Persist reviews added to the cache
+        if self._review_cache_dirty:
+            self.update_context_memory("review_cache", self._review_cache)
+            self._review_cache_dirty = False
+        
+        # Update reviewed hypotheses in context memory in one write, once per hypothesis
+        completed = [h for h in found if h["id"] not in errored]
+        if completed:
+            async with self.context_memory.lock("reviewed_hypotheses"):
+                reviewed = self.get_from_context_memory("reviewed_hypotheses", [])
+                already_reviewed = set(reviewed)
+                reviewed.extend(h["id"] for h in completed if h["id"] not in already_reviewed)
+                self.update_context_memory("reviewed_hypotheses", reviewed)
+        
+        return [
+            results.get(h_id) or {"error": f"Hypothesis {h_id} not found"}
+            for h_id in hypothesis_ids
+        ]
+    
+    def _get_review_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Get the review cache, loading it from context memory on first use.
+        
+        Returns:
+            Review results keyed by review type and statement hash
+        """
+        if self._review_cache is None:
+            self._review_cache = self.get_from_context_memory("review_cache", {})
+        return self._review_cache
     
+    @_memoize_by_statement("initial")
     async def _perform_initial_review(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Perform initial review of a hypothesis.
         
@@ -128,6 +263,7 @@ class ReflectionAgent(BaseAgent):
             "passed": True
         }
     
+    @_memoize_by_statement("full")
     async def _perform_full_review(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Perform full review of a hypothesis.
         
@@ -161,6 +297,7 @@ class ReflectionAgent(BaseAgent):
             "passed": True
         }
     
+    @_memoize_by_statement("deep_verification")
     async def _perform_deep_verification(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Perform deep verification review of a hypothesis.
         
@@ -197,6 +334,7 @@ class ReflectionAgent(BaseAgent):
             "passed": True
         }
     
+    @_memoize_by_statement("observation")
     async def _perform_observation_review(self, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
         """Perform observation review of a hypothesis.
         
@@ -1,10 +1,198 @@
 """Supervisor agent for coordinating all other specialized agents."""
 
 import asyncio
-from typing import Any, Dict, List, Optional, Type
+import hashlib
+import itertools
+import json
+import logging
+import os
+from collections import Counter, deque
+from typing import Any, Awaitable, Deque, Dict, List, Optional, Set, Tuple, Type
 
 from .base_agent import BaseAgent
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_GOAL_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai-co-scientist", "research_goals.json")
+
+class _WorkStealingQueue:
+    """Task queue with one deque per worker and work stealing.
+    
+    Each agent is assigned its own workers, and its tasks are pushed round
+    robin to their deques. Workers pop from the front of their own deque
+    and, when it is empty, steal from the back of the deque of another
+    worker of the same agent, so an agent's tasks never wait behind a slow
+    task of another agent. Workers not assigned to any agent may steal from
+    every worker. Supports the put/get/task_done/join subset of asyncio.Queue
+    used by the supervisor; like asyncio.Queue, put waits while the queue
+    holds maxsize tasks.
+    """
+    
+    def __init__(self, num_workers: int, maxsize: int = 0, agent_workers: Optional[Dict[str, List[int]]] = None):
+        """Initialize the queue.
+        
+        Args:
+            num_workers: Number of workers, one local deque each
+            maxsize: Maximum number of queued tasks (0 for unbounded)
+            agent_workers: Agent name -> indexes of the workers its tasks go to;
+                tasks of other agents go to a worker chosen by hashing the name
+        """
+        self.maxsize = maxsize
+        self._agent_workers = {name: itertools.cycle(workers) for name, workers in (agent_workers or {}).items() if workers}
+        
+        # Worker index -> indexes of the workers it may steal from
+        assigned: Dict[int, Set[int]] = {}
+        for workers in (agent_workers or {}).values():
+            for worker in workers:
+                assigned.setdefault(worker, set()).update(workers)
+        everyone = set(range(num_workers))
+        self._victims = [(assigned.get(worker) or everyone) - {worker} for worker in range(num_workers)]
+        
+        self.local_queues: List[Deque[Dict[str, Any]]] = [deque() for _ in range(num_workers)]
+        self.wake_events = [asyncio.Event() for _ in range(num_workers)]
+        self._idle: Set[int] = set()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+    
+    def empty(self) -> bool:
+        return not any(self.local_queues)
+    
+    def qsize(self) -> int:
+        return sum(len(q) for q in self.local_queues)
+    
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+    
+    async def put(self, task: Dict[str, Any]) -> None:
+        while self.full():
+            self._not_full.clear()
+            await self._not_full.wait()
+        self.put_nowait(task)
+    
+    def put_nowait(self, task: Dict[str, Any]) -> None:
+        """Push a task to its agent's worker and wake a worker to run it.
+        
+        Args:
+            task: Task to queue
+            
+        Raises:
+            asyncio.QueueFull: If the queue holds maxsize tasks
+        """
+        if self.full():
+            raise asyncio.QueueFull
+        self._wake(self._push(task))
+    
+    async def put_many(self, tasks: List[Dict[str, Any]]) -> None:
+        """Push several tasks, waking workers only after all are queued.
+        
+        Waits while the queue is full. The whole list is queued at once, so
+        it may take the queue past maxsize.
+        
+        Args:
+            tasks: Tasks to queue
+        """
+        if not tasks:
+            return
+        while self.full():
+            self._not_full.clear()
+            await self._not_full.wait()
+        owners = [self._push(task) for task in tasks]
+        for owner in owners:
+            self._wake(owner)
+    
+    def _push(self, task: Dict[str, Any]) -> int:
+        """Append a task to its agent's worker deque without waking anyone.
+        
+        Args:
+            task: Task to queue
+            
+        Returns:
+            Index of the worker owning the task
+        """
+        workers = self._agent_workers.get(task.get("agent"))
+        owner = next(workers) if workers else hash(task.get("agent")) % len(self.local_queues)
+        self.local_queues[owner].append(task)
+        self._unfinished += 1
+        self._finished.clear()
+        return owner
+    
+    def _wake(self, owner: int) -> None:
+        """Wake the owner if it is waiting, otherwise an idle worker allowed to steal the task.
+        
+        Args:
+            owner: Index of the worker owning a new task
+        """
+        if owner not in self._idle:
+            owner = next((worker for worker in self._idle if owner in self._victims[worker]), owner)
+        self._idle.discard(owner)
+        self.wake_events[owner].set()
+    
+    def get_nowait(self, worker: int, agent: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Pop a task from a worker's own deque without waiting.
+        
+        Args:
+            worker: Index of the worker
+            agent: If given, only pop the first task if it is for this agent
+            
+        Returns:
+            First task of the worker's deque, or None if it is empty or for another agent
+        """
+        own = self.local_queues[worker]
+        if not own or (agent is not None and own[0].get("agent") != agent):
+            return None
+        self._not_full.set()
+        return own.popleft()
+    
+    def _steal(self, worker: int) -> Optional[Dict[str, Any]]:
+        """Pop a task from the back of the deque of a worker the given one may steal from.
+        
+        Args:
+            worker: Index of the stealing worker
+            
+        Returns:
+            Stolen task, or None if there is nothing to steal
+        """
+        victim = next((self.local_queues[i] for i in self._victims[worker] if self.local_queues[i]), None)
+        if victim is None:
+            return None
+        self._not_full.set()
+        return victim.pop()
+    
+    async def get(self, worker: int) -> Dict[str, Any]:
+        """Pop a task for a worker, waiting until one is queued.
+        
+        Args:
+            worker: Index of the worker
+            
+        Returns:
+            Next task of the worker's own deque, else one stolen from another worker
+        """
+        while True:
+            task = self.get_nowait(worker)
+            if task is None:
+                task = self._steal(worker)
+            if task is not None:
+                return task
+            self.wake_events[worker].clear()
+            self._idle.add(worker)
+            try:
+                await self.wake_events[worker].wait()
+            finally:
+                self._idle.discard(worker)
+    
+    def task_done(self) -> None:
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+    
+    async def join(self) -> None:
+        await self._finished.wait()
+
 class SupervisorAgent(BaseAgent):
     """Supervisor agent that coordinates the execution of specialized agents.
     
@@ -12,6 +200,10 @@ class SupervisorAgent(BaseAgent):
     and allocates resources for the AI Co-Scientist system.
     """
     
+    # Result keys written by the agents themselves: hypotheses through
+    # add_hypotheses and tournament_state through field deltas
+    AGENT_PERSISTED_KEYS = frozenset({"hypotheses", "tournament_state"})
+    
     def __init__(
         self, 
         model_config: Dict[str, Any], 
@@ -27,9 +219,32 @@ class SupervisorAgent(BaseAgent):
         """
         super().__init__(model_config, context_memory)
         self.agents = agents or {}
-        self.task_queue = asyncio.Queue()
+        self.task_queue = _WorkStealingQueue(1)
         self.workers = []
         self.running = False
+        
+        # Set by workers whenever a task finishes
+        self._progress_event = asyncio.Event()
+        
+        # Statistics cached against the versions of the keys they are computed from
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_versions: Optional[Tuple[int, ...]] = None
+        
+        # Indexes of the append-only hypotheses and reviewed_hypotheses lists,
+        # extended with the entries added since the statistics were last computed
+        self._indexed_hypotheses = 0
+        self._last_indexed_id: Optional[str] = None
+        self._method_counts: Counter = Counter()
+        self._unreviewed: Dict[str, None] = {}
+        self._reviewed_ids: Set[str] = set()
+        self._indexed_reviewed = 0
+        
+        # Keys of queued or running tasks, so identical tasks are not queued twice
+        self._in_flight: Set[Tuple[Any, ...]] = set()
+        
+        # Quality check of the statistics dict it was last evaluated on
+        self._terminal_stats: Optional[Dict[str, Any]] = None
+        self._terminal_quality = False
     
     def register_agent(self, agent_name: str, agent: BaseAgent) -> None:
         """Register a specialized agent with the supervisor.
@@ -52,27 +267,122 @@ class SupervisorAgent(BaseAgent):
         research_plan = task.get("research_plan", {})
         self.update_context_memory("research_plan", research_plan)
         
-        # Parse the research goal and create a research plan configuration
-        await self._parse_research_goal(task.get("research_goal", ""))
+        # Recreated per run, since an event can't be shared across event loops
+        self._progress_event = asyncio.Event()
         
-        # Start worker tasks
+        # The queue is replaced below, so keys of tasks left in the old one are stale
+        self._in_flight.clear()
+        
+        # Warm up model connections while parsing the research goal into a
+        # research plan configuration; both are startup I/O and independent
+        await asyncio.gather(
+            self.prewarm(self.model_config.get("prewarm_connections", 8)),
+            self._parse_research_goal(task.get("research_goal", ""))
+        )
+        
+        # Start worker tasks, each with its own local task queue. The queue is
+        # bounded so adding tasks waits when workers fall behind.
+        workers_per_agent = task.get("workers_per_agent")
+        num_workers = sum(workers_per_agent.values()) if workers_per_agent else task.get("num_workers", 5)
+        self.task_queue = _WorkStealingQueue(
+            num_workers,
+            maxsize=max(16, num_workers * 4),
+            agent_workers=self._assign_workers(num_workers, workers_per_agent)
+        )
+        stats = await self._run_with_workers(
+            num_workers,
+            task.get("max_batch_size", 5),
+            self._run_iterations(research_plan, task.get("max_iterations", 10), task.get("progress_timeout", 2.0))
+        )
+        
+        # Generate final research overview
+        if "meta_review" in self.agents:
+            research_overview = await self.agents["meta_review"].execute({
+                "task_type": "generate_research_overview",
+                "top_hypotheses": self.get_from_context_memory("top_hypotheses", [])
+            })
+            self.update_context_memory("research_overview", research_overview)
+        
+        return {
+            "status": "completed",
+            "research_overview": self.get_from_context_memory("research_overview", {}),
+            "top_hypotheses": self.get_from_context_memory("top_hypotheses", []),
+            "statistics": stats
+        }
+    
+    async def _run_with_workers(self, num_workers: int, max_batch_size: int, main: Awaitable[Any]) -> Any:
+        """Run workers while awaiting main, then stop them.
+        
+        Workers run in an asyncio.TaskGroup where available (Python 3.11+),
+        so an unexpected worker failure cancels main. On every version the
+        first failure is raised here as the original exception, not wrapped
+        in an ExceptionGroup. All workers have finished when this returns.
+        
+        Args:
+            num_workers: Number of workers to start
+            max_batch_size: Maximum number of tasks a worker takes at once
+            main: Awaitable to run while the workers process the queue
+            
+        Returns:
+            Result of main
+        """
         self.running = True
-        self.workers = [
-            asyncio.create_task(self._worker()) 
-            for _ in range(task.get("num_workers", 5))
-        ]
+        try:
+            if hasattr(asyncio, "TaskGroup"):
+                try:
+                    async with asyncio.TaskGroup() as group:
+                        self.workers = [group.create_task(self._worker(i, max_batch_size)) for i in range(num_workers)]
+                        try:
+                            return await main
+                        finally:
+                            self._stop_workers()
+                except BaseExceptionGroup as failures:
+                    # Unwrap so callers see the same exception as on older versions
+                    raise failures.exceptions[0] from None
+            
+            self.workers = [asyncio.create_task(self._worker(i, max_batch_size)) for i in range(num_workers)]
+            try:
+                result = await main
+            finally:
+                self._stop_workers()
+                outcomes = await asyncio.gather(*self.workers, return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException) and not isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+            return result
+        finally:
+            self.workers = []
+    
+    def _stop_workers(self) -> None:
+        """Cancel all workers; callers wait for them to finish."""
+        self.running = False
+        for worker in self.workers:
+            worker.cancel()
+    
+    async def _run_iterations(self, research_plan: Dict[str, Any], max_iterations: int, progress_timeout: float) -> Dict[str, Any]:
+        """Queue the starting tasks and supervise until a terminal state.
         
+        Args:
+            research_plan: Research plan configuration
+            max_iterations: Maximum number of iterations to run
+            progress_timeout: Maximum time to wait for worker progress per iteration
+            
+        Returns:
+            Statistics of the last iteration
+        """
         # Initialize the task queue with starting tasks
         await self._initialize_task_queue(research_plan)
         
         # Wait for research plan to complete
-        max_iterations = task.get("max_iterations", 10)
+        stats_history: List[Dict[str, Any]] = []
+        stats: Dict[str, Any] = {}
         for i in range(max_iterations):
-            await asyncio.sleep(2.0)  # Wait for worker progress
+            await self._wait_for_progress(progress_timeout)
             
             # Calculate and store statistics
             stats = self._calculate_statistics()
-            self.update_context_memory(f"stats_iteration_{i}", stats)
+            stats_history.append(stats)
+            self.update_context_memory("stats_history", stats_history)
             
             # Check if terminal state is reached
             if self._check_terminal_state(stats, i, max_iterations):
@@ -81,47 +391,107 @@ class SupervisorAgent(BaseAgent):
             # Update task queue based on current state
             await self._update_task_queue(stats)
         
-        # Stop all workers
-        self.running = False
-        for worker in self.workers:
-            worker.cancel()
+        return stats
+    
+    def _assign_workers(self, num_workers: int, workers_per_agent: Optional[Dict[str, int]] = None) -> Dict[str, List[int]]:
+        """Assign workers to agents so each agent's tasks have their own queues.
         
-        # Generate final research overview
-        if "meta_review" in self.agents:
-            research_overview = await self.agents["meta_review"].execute({
-                "task_type": "generate_research_overview",
-                "top_hypotheses": self.get_from_context_memory("top_hypotheses", [])
-            })
-            self.update_context_memory("research_overview", research_overview)
+        Args:
+            num_workers: Total number of workers
+            workers_per_agent: Number of workers for each agent; if not given,
+                agents are assigned one worker each in registration order,
+                sharing workers when there are more agents than workers
+            
+        Returns:
+            Agent name -> indexes of its workers
+        """
+        if not workers_per_agent:
+            return {name: [i % num_workers] for i, name in enumerate(self.agents)} if num_workers else {}
         
-        return {
-            "status": "completed",
-            "research_overview": self.get_from_context_memory("research_overview", {}),
-            "top_hypotheses": self.get_from_context_memory("top_hypotheses", []),
-            "statistics": self.get_from_context_memory(f"stats_iteration_{i}", {})
-        }
+        assignment = {}
+        start = 0
+        for name, count in workers_per_agent.items():
+            assignment[name] = list(range(start, start + count))
+            start += count
+        return assignment
+    
+    async def _wait_for_progress(self, timeout: float) -> None:
+        """Wait until a worker finishes a task, or at most timeout seconds.
+        
+        If the queue drains within the timeout, also wait for the remaining
+        tasks so the statistics reflect a quiesced state.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        try:
+            await asyncio.wait_for(self._progress_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return
+        finally:
+            self._progress_event.clear()
+        
+        if self.task_queue.empty():
+            try:
+                await asyncio.wait_for(self.task_queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
     
-    async def _worker(self) -> None:
-        """Worker process that executes tasks from the queue."""
+    async def _worker(self, worker: int = 0, max_batch_size: int = 5) -> None:
+        """Worker process that executes tasks from the queue.
+        
+        Tasks for the same agent already waiting at the front of the
+        worker's deque are taken together, up to max_batch_size, and run as
+        one batch, so a batch never waits on another agent's tasks.
+        
+        Args:
+            worker: Index of the worker's local task queue
+            max_batch_size: Maximum number of tasks taken at once
+        """
         while self.running:
             try:
-                task = await self.task_queue.get()
-                agent_name = task.get("agent")
-                
+                batch = [await self.task_queue.get(worker)]
+            except asyncio.CancelledError:
+                break
+            agent_name = batch[0].get("agent")
+            while len(batch) < max_batch_size:
+                task = self.task_queue.get_nowait(worker, agent_name)
+                if task is None:
+                    break
+                batch.append(task)
+            
+            try:
                 if agent_name in self.agents:
-                    agent = self.agents[agent_name]
-                    result = await agent.execute(task)
-                    
-                    # Store results in context memory
-                    for key, value in result.items():
-                        self.update_context_memory(key, value)
-                
-                self.task_queue.task_done()
+                    await self._run_batch(self.agents[agent_name], batch)
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                print(f"Error in worker: {e}")
-                self.task_queue.task_done()
+            except Exception:
+                logger.exception("Error running %d %s task(s) in worker %d", len(batch), agent_name, worker)
+            finally:
+                for task in batch:
+                    self._in_flight.discard(self._task_key(task))
+                    self.task_queue.task_done()
+                self._progress_event.set()
+    
+    async def _run_batch(self, agent: BaseAgent, tasks: List[Dict[str, Any]]) -> None:
+        """Execute a batch of tasks on one agent and store the results.
+        
+        Args:
+            agent: Agent to run the tasks on
+            tasks: Tasks for the agent
+        """
+        results = await agent.execute_batch(tasks) if len(tasks) > 1 else [await agent.execute(tasks[0])]
+        
+        # Store results in context memory in one write; later results win for shared keys.
+        # Keys the agents persist themselves are skipped, since rewriting them
+        # whole would undo their incremental writes.
+        values: Dict[str, Any] = {}
+        for result in results:
+            values.update(result)
+        for key in self.AGENT_PERSISTED_KEYS:
+            values.pop(key, None)
+        if values:
+            self.update_context_memory_many(values)
     
     async def _parse_research_goal(self, research_goal: str) -> None:
         """Parse the research goal to derive a research plan configuration.
@@ -131,6 +501,14 @@ class SupervisorAgent(BaseAgent):
         """
         if not research_goal:
             return
+        
+        # Reuse the parse from an earlier run with the same goal and model config
+        cache_path = self._goal_cache_path()
+        key = hashlib.blake2b(self._config_digest() + research_goal.encode(), digest_size=16).hexdigest()
+        cache = self._load_goal_cache(cache_path) if cache_path else {}
+        if key in cache:
+            self.update_context_memory("research_plan_config", {"raw_goal": research_goal, "parsed_config": cache[key]})
+            return
             
         prompt = f"""
         Parse the following research goal to derive a research plan configuration:
@@ -147,6 +525,55 @@ class SupervisorAgent(BaseAgent):
         response = await self._call_model(prompt)
         research_plan_config = {"raw_goal": research_goal, "parsed_config": response}
         self.update_context_memory("research_plan_config", research_plan_config)
+        
+        if cache_path:
+            cache[key] = response
+            self._save_goal_cache(cache_path, cache)
+    
+    def _goal_cache_path(self) -> Optional[str]:
+        """Get the file of parsed research goals if the cache is enabled in the model config.
+        
+        Returns:
+            Path of the cache file or None if disabled
+        """
+        config = self.model_config.get("goal_cache")
+        if not config:
+            return None
+        options = config if isinstance(config, dict) else {}
+        return options.get("path", DEFAULT_GOAL_CACHE_PATH)
+    
+    @staticmethod
+    def _load_goal_cache(path: str) -> Dict[str, str]:
+        """Read parsed research goals saved by earlier runs.
+        
+        Args:
+            path: Path of the cache file
+            
+        Returns:
+            Parsed goals keyed by goal and model config digest
+        """
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _save_goal_cache(path: str, cache: Dict[str, str]) -> None:
+        """Write parsed research goals, replacing the file atomically.
+        
+        Args:
+            path: Path of the cache file
+            cache: Parsed goals keyed by goal and model config digest
+        """
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception("Error saving research goal cache")
     
     async def _initialize_task_queue(self, research_plan: Dict[str, Any]) -> None:
         """Initialize the task queue with starting tasks.
@@ -168,9 +595,11 @@ class SupervisorAgent(BaseAgent):
         Args:
             stats: Current system statistics
         """
+        tasks = []
+        
         # Add more generation tasks if needed
         if stats.get("num_hypotheses", 0) < stats.get("target_hypotheses", 20):
-            await self.task_queue.put({
+            tasks.append({
                 "agent": "generation",
                 "task_type": "generate_hypotheses",
                 "count": 5
@@ -178,16 +607,16 @@ class SupervisorAgent(BaseAgent):
         
         # Add review tasks for unreviewed hypotheses
         unreviewed = stats.get("unreviewed_hypotheses", [])
-        for hypothesis_id in unreviewed[:5]:  # Process up to 5 at a time
-            await self.task_queue.put({
+        if unreviewed:
+            tasks.append({
                 "agent": "reflection",
-                "task_type": "review_hypothesis",
-                "hypothesis_id": hypothesis_id
+                "task_type": "review_hypotheses",
+                "hypothesis_ids": unreviewed[:5]  # Process up to 5 at a time
             })
         
         # Add tournament tasks
         if stats.get("tournament_progress", 0) < 0.8:  # 80% complete
-            await self.task_queue.put({
+            tasks.append({
                 "agent": "ranking",
                 "task_type": "run_tournament_matches",
                 "count": 10
@@ -196,11 +625,39 @@ class SupervisorAgent(BaseAgent):
         # Add evolution tasks for top hypotheses
         top_hypotheses = stats.get("top_hypotheses", [])
         for hypothesis_id in top_hypotheses[:3]:  # Top 3 hypotheses
-            await self.task_queue.put({
+            tasks.append({
                 "agent": "evolution",
                 "task_type": "evolve_hypothesis",
                 "hypothesis_id": hypothesis_id
             })
+        
+        # Skip tasks identical to one that is still queued or running
+        new_tasks = []
+        for task in tasks:
+            key = self._task_key(task)
+            if key not in self._in_flight:
+                self._in_flight.add(key)
+                new_tasks.append(task)
+        
+        # Queue all tasks at once so workers are woken once per iteration
+        await self.task_queue.put_many(new_tasks)
+    
+    @staticmethod
+    def _task_key(task: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Identify a task by agent, task type and the hypotheses it acts on.
+        
+        Args:
+            task: Task parameters
+            
+        Returns:
+            Hashable key of the task
+        """
+        return (
+            task.get("agent"),
+            task.get("task_type"),
+            task.get("hypothesis_id") or "",
+            tuple(task.get("hypothesis_ids", ()))
+        )
     
     def _calculate_statistics(self) -> Dict[str, Any]:
         """Calculate system statistics from the context memory.
@@ -208,33 +665,61 @@ class SupervisorAgent(BaseAgent):
         Returns:
             Dictionary of statistics
         """
+        versions = tuple(
+            self.context_memory.version(key)
+            for key in ("hypotheses", "reviewed_hypotheses", "tournament_state")
+        )
+        if self._stats is not None and versions == self._stats_versions:
+            return self._stats
+        
         hypotheses = self.get_from_context_memory("hypotheses", [])
         reviewed = self.get_from_context_memory("reviewed_hypotheses", [])
         tournament = self.get_from_context_memory("tournament_state", {})
+        self._index_hypotheses(hypotheses, reviewed)
         
-        return {
+        self._stats = {
             "num_hypotheses": len(hypotheses),
             "num_reviewed": len(reviewed),
-            "unreviewed_hypotheses": [h["id"] for h in hypotheses if h["id"] not in reviewed],
+            "unreviewed_hypotheses": list(self._unreviewed),
             "tournament_progress": tournament.get("progress", 0),
             "top_hypotheses": tournament.get("top_ranked", [])[:10],
-            "generation_methods": self._count_generation_methods(hypotheses)
+            "generation_methods": dict(self._method_counts)
         }
+        self._stats_versions = versions
+        return self._stats
     
-    def _count_generation_methods(self, hypotheses: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Count hypotheses by generation method.
+    def _index_hypotheses(self, hypotheses: List[Dict[str, Any]], reviewed: List[str]) -> None:
+        """Bring the generation method counts and unreviewed IDs up to date.
+        
+        Both lists only grow, so only entries added since the last call are
+        processed. The indexes are rebuilt if a list was replaced by a
+        shorter or different one.
         
         Args:
-            hypotheses: List of hypotheses
-            
-        Returns:
-            Dictionary with counts by method
+            hypotheses: List of all hypotheses
+            reviewed: IDs of reviewed hypotheses
         """
-        methods = {}
-        for h in hypotheses:
-            method = h.get("generation_method", "unknown")
-            methods[method] = methods.get(method, 0) + 1
-        return methods
+        n = self._indexed_hypotheses
+        if len(hypotheses) < n or (n and hypotheses[n - 1]["id"] != self._last_indexed_id):
+            n = self._indexed_hypotheses = 0
+            self._method_counts = Counter()
+            self._unreviewed = {}
+        if len(reviewed) < self._indexed_reviewed or not n:
+            self._reviewed_ids = set()
+            self._indexed_reviewed = 0
+        
+        for h_id in reviewed[self._indexed_reviewed:]:
+            self._reviewed_ids.add(h_id)
+            self._unreviewed.pop(h_id, None)
+        self._indexed_reviewed = len(reviewed)
+        
+        for h in hypotheses[n:]:
+            self._method_counts[h.get("generation_method", "unknown")] += 1
+            if h["id"] not in self._reviewed_ids:
+                self._unreviewed[h["id"]] = None
+        if hypotheses:
+            self._indexed_hypotheses = len(hypotheses)
+            self._last_indexed_id = hypotheses[-1]["id"]
     
     def _check_terminal_state(self, stats: Dict[str, Any], iteration: int, max_iterations: int) -> bool:
         """Check if the terminal state for computation has been reached.
@@ -252,14 +737,17 @@ class SupervisorAgent(BaseAgent):
         if iteration >= max_iterations - 1:
             return True
             
-        # 2. Enough high-quality hypotheses generated and reviewed
-        min_hypotheses = 10
-        if (stats.get("num_hypotheses", 0) >= min_hypotheses and 
-            stats.get("num_reviewed", 0) >= min_hypotheses and
-            len(stats.get("top_hypotheses", [])) >= 5):
-            
-            # Check if tournament is nearly complete
-            if stats.get("tournament_progress", 0) > 0.9:  # 90% complete
-                return True
+        # 2. Enough high-quality hypotheses generated and reviewed; statistics
+        # are reused until their inputs change, so is this check
+        if stats is not self._terminal_stats:
+            min_hypotheses = 10
+            self._terminal_quality = (
+                stats.get("num_hypotheses", 0) >= min_hypotheses and
+                stats.get("num_reviewed", 0) >= min_hypotheses and
+                len(stats.get("top_hypotheses", [])) >= 5 and
+                # Check if tournament is nearly complete
+                stats.get("tournament_progress", 0) > 0.9  # 90% complete
+            )
+            self._terminal_stats = stats
         
-        return False
\ No newline at end of file
+        return self._terminal_quality
\ No newline at end of file
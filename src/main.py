@@ -3,10 +3,21 @@
 import asyncio
 import argparse
 import json
-from typing import Dict, Any, Optional
+import logging
+import logging.handlers
+import queue
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 from agents import (
     BaseAgent,
+    InMemoryStore,
+    RedisStore,
     SupervisorAgent,
     GenerationAgent,
     ReflectionAgent,
@@ -21,7 +32,8 @@ async def run_co_scientist(
     output_file: Optional[str] = None,
     max_iterations: int = 10,
     num_workers: int = 5,
-    model_config: Optional[Dict[str, Any]] = None
+    model_config: Optional[Mapping[str, Any]] = None,
+    redis_url: Optional[str] = None
 ) -> Dict[str, Any]:
     """Run the AI Co-Scientist system on a research goal.
     
@@ -36,7 +48,7 @@ async def run_co_scientist(
         Results from the co-scientist system
     """
     # Initialize shared context memory
-    context_memory = {}
+    context_memory = RedisStore(redis_url) if redis_url else InMemoryStore()
     
     # Create model configuration if not provided
     if model_config is None:
@@ -46,6 +58,9 @@ async def run_co_scientist(
             "max_tokens": 8192
         }
     
+    # One read-only config shared by every agent, so no agent can change it for the others
+    model_config = MappingProxyType(dict(model_config))
+    
     # Create agents
     supervisor = SupervisorAgent(model_config, context_memory)
     
@@ -58,19 +73,58 @@ async def run_co_scientist(
     supervisor.register_agent("meta_review", MetaReviewAgent(model_config, context_memory))
     
     # Execute the research plan
-    results = await supervisor.execute({
-        "research_goal": research_goal,
-        "max_iterations": max_iterations,
-        "num_workers": num_workers
-    })
+    try:
+        results = await supervisor.execute({
+            "research_goal": research_goal,
+            "max_iterations": max_iterations,
+            "num_workers": num_workers
+        })
+    finally:
+        await BaseAgent.aclose()
     
-    # Save results if output file specified
+    # Save results if output file specified, serializing and writing off the event loop
     if output_file:
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        await asyncio.get_running_loop().run_in_executor(None, _write_results, output_file, results)
     
     return results
 
+def _write_results(output_file: str, results: Dict[str, Any]) -> None:
+    """Write results as indented JSON, with orjson when it is installed.
+    
+    Args:
+        output_file: Path to save results
+        results: Results from the co-scientist system
+    """
+    if orjson is not None:
+        data = orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data = json.dumps(results, indent=2, default=str).encode()
+    with open(output_file, 'wb') as f:
+        f.write(data)
+
+def configure_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Send log records through a queue to a background thread.
+    
+    Agents log from the event loop, so writing to stderr happens on the
+    listener thread instead of blocking the loop.
+    
+    Args:
+        level: Level of the root logger
+        
+    Returns:
+        Started listener; stop it to flush remaining records
+    """
+    log_queue: queue.Queue = queue.Queue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    return listener
+
 def main():
     """Command-line entry point."""
     parser = argparse.ArgumentParser(description="AI Co-Scientist system")
@@ -80,6 +134,9 @@ def main():
     parser.add_argument("--workers", type=int, default=5, help="Number of worker processes")
     parser.add_argument("--model", type=str, default="gemini-2.0", help="Model name to use")
     parser.add_argument("--temperature", type=float, default=0.7, help="Model temperature")
+    parser.add_argument("--endpoint", type=str, help="Gemini generateContent endpoint URL")
+    parser.add_argument("--redis-url", type=str, help="Redis URL for context memory shared across processes")
+    parser.add_argument("--goal-cache", action="store_true", help="Reuse parsed research goals from earlier runs")
     
     args = parser.parse_args()
     
@@ -99,15 +156,24 @@ def main():
         "temperature": args.temperature,
         "max_tokens": 8192
     }
+    if args.endpoint:
+        model_config["endpoint"] = args.endpoint
+    if args.goal_cache:
+        model_config["goal_cache"] = True
     
     # Run the co-scientist system
-    asyncio.run(run_co_scientist(
-        research_goal=research_goal,
-        output_file=args.output,
-        max_iterations=args.iterations,
-        num_workers=args.workers,
-        model_config=model_config
-    ))
+    listener = configure_logging()
+    try:
+        asyncio.run(run_co_scientist(
+            research_goal=research_goal,
+            output_file=args.output,
+            max_iterations=args.iterations,
+            num_workers=args.workers,
+            model_config=model_config,
+            redis_url=args.redis_url
+        ))
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
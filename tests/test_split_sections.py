@@ -0,0 +1,41 @@
+"""Tests for splitting structured generation responses into sections."""
+
+from agents.generation_agent import _split_sections
+
+def test_splits_sections_in_response_order():
+    text = "HYPOTHESIS: Cells divide\nfaster.\nRATIONALE: Because.\nTESTABILITY: Count them."
+    
+    assert _split_sections(text) == [
+        ("HYPOTHESIS", "Cells divide\nfaster."),
+        ("RATIONALE", "Because."),
+        ("TESTABILITY", "Count them.")
+    ]
+
+def test_drops_numbers_from_headers():
+    text = "HYPOTHESIS 1: First\nHYPOTHESIS 2: Second"
+    
+    assert _split_sections(text) == [("HYPOTHESIS", "First"), ("HYPOTHESIS", "Second")]
+
+def test_multi_word_headers_are_not_split_on_their_last_word():
+    text = "LITERATURE SUMMARY: Prior work\nFINAL HYPOTHESIS: The claim"
+    
+    assert _split_sections(text) == [("LITERATURE SUMMARY", "Prior work"), ("FINAL HYPOTHESIS", "The claim")]
+
+def test_headers_must_start_a_line():
+    text = "HYPOTHESIS: The RATIONALE: is part of the statement"
+    
+    assert _split_sections(text) == [("HYPOTHESIS", "The RATIONALE: is part of the statement")]
+
+def test_indented_headers_are_recognized():
+    text = "  HYPOTHESIS: A\n\tRATIONALE: B"
+    
+    assert _split_sections(text) == [("HYPOTHESIS", "A"), ("RATIONALE", "B")]
+
+def test_text_before_the_first_header_is_ignored():
+    assert _split_sections("Preamble\nHYPOTHESIS: A") == [("HYPOTHESIS", "A")]
+
+def test_empty_section_bodies_are_kept():
+    assert _split_sections("HYPOTHESIS:\nRATIONALE: B") == [("HYPOTHESIS", ""), ("RATIONALE", "B")]
+
+def test_response_without_headers_has_no_sections():
+    assert _split_sections("Just prose.") == []
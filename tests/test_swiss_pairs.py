@@ -0,0 +1,60 @@
+"""Tests for the ranking agent's Swiss-round pairing."""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agents.ranking_agent import RankingAgent
+
+def swiss_pairs(ratings: Dict[str, float], faced: Optional[Dict[str, List[str]]] = None, **model_config) -> List[List[str]]:
+    """Pair one Swiss round for hypotheses given as ID -> rating."""
+    agent = RankingAgent(model_config)
+    hypotheses = [{"id": h_id} for h_id in ratings]
+    values = np.array(list(ratings.values()), dtype=np.float64)
+    return agent._swiss_pairs(hypotheses, values, faced or {})
+
+def test_pairs_neighbours_in_the_ranking():
+    pairs = swiss_pairs({"c": 1200, "a": 1400, "d": 1100, "b": 1300})
+    
+    assert pairs == [["a", "b"], ["c", "d"]]
+
+def test_skips_opponents_already_faced():
+    pairs = swiss_pairs({"a": 1400, "b": 1300, "c": 1200, "d": 1100}, faced={"a": ["b"], "b": ["a"]})
+    
+    assert pairs == [["a", "c"], ["b", "d"]]
+
+def test_rematch_when_every_candidate_was_faced():
+    pairs = swiss_pairs({"a": 1300, "b": 1200}, faced={"a": ["b"], "b": ["a"]})
+    
+    assert pairs == [["a", "b"]]
+
+def test_bye_goes_to_the_lowest_rated_with_an_odd_count():
+    pairs = swiss_pairs({"a": 1300, "b": 1200, "c": 1100})
+    
+    assert pairs == [["a", "b"]]
+
+def test_bye_goes_to_the_hypothesis_that_played_most():
+    pairs = swiss_pairs({"a": 1300, "b": 1200, "c": 1100}, faced={"a": ["x", "y"], "c": ["x"]})
+    
+    assert pairs == [["b", "c"]]
+
+def test_hypothesis_stored_twice_is_not_paired_with_itself():
+    agent = RankingAgent({})
+    hypotheses = [{"id": "a"}, {"id": "a"}, {"id": "b"}]
+    values = np.array([1300.0, 1300.0, 1200.0])
+    
+    assert agent._swiss_pairs(hypotheses, values, {}) == [["a", "b"]]
+
+def test_max_rating_gap_leaves_distant_hypotheses_unpaired():
+    pairs = swiss_pairs({"a": 1500, "b": 1200, "c": 1190, "d": 1000}, max_rating_gap=100)
+    
+    assert pairs == [["b", "c"]]
+
+def test_max_rating_gap_prefers_a_rematch_within_the_gap():
+    pairs = swiss_pairs(
+        {"a": 1300, "b": 1290, "c": 1000, "d": 990},
+        faced={"a": ["b"], "b": ["a"]},
+        max_rating_gap=50
+    )
+    
+    assert pairs == [["a", "b"], ["c", "d"]]
@@ -0,0 +1,139 @@
+"""Tests for the supervisor's work-stealing task queue."""
+
+import asyncio
+
+import pytest
+
+from agents.supervisor_agent import _WorkStealingQueue
+
+def run(coro):
+    """Run a coroutine on a fresh event loop."""
+    return asyncio.run(coro)
+
+def task(agent: str, n: int) -> dict:
+    """Build a minimal task for an agent."""
+    return {"agent": agent, "n": n}
+
+def test_tasks_go_round_robin_to_their_agents_workers():
+    async def scenario():
+        queue = _WorkStealingQueue(3, agent_workers={"a": [0, 1], "b": [2]})
+        for n in range(4):
+            queue.put_nowait(task("a", n))
+        queue.put_nowait(task("b", 0))
+        return [[t["n"] for t in q] for q in queue.local_queues]
+    
+    assert run(scenario()) == [[0, 2], [1, 3], [0]]
+
+def test_get_nowait_pops_only_the_workers_own_deque():
+    async def scenario():
+        queue = _WorkStealingQueue(2, agent_workers={"a": [0, 1]})
+        queue.put_nowait(task("a", 0))
+        return queue.get_nowait(1), queue.get_nowait(0)
+    
+    assert run(scenario()) == (None, task("a", 0))
+
+def test_get_nowait_with_agent_stops_at_another_agents_task():
+    async def scenario():
+        queue = _WorkStealingQueue(1, agent_workers={"a": [0], "b": [0]})
+        queue.put_nowait(task("a", 0))
+        queue.put_nowait(task("b", 0))
+        first = queue.get_nowait(0, "a")
+        second = queue.get_nowait(0, "a")
+        return first, second, queue.qsize()
+    
+    assert run(scenario()) == (task("a", 0), None, 1)
+
+def test_idle_worker_steals_from_the_back_of_a_same_agent_deque():
+    async def scenario():
+        queue = _WorkStealingQueue(2, agent_workers={"a": [0, 1]})
+        queue.local_queues[0].extend([task("a", 0), task("a", 1)])
+        return await asyncio.wait_for(queue.get(1), timeout=1)
+    
+    assert run(scenario()) == task("a", 1)
+
+def test_worker_does_not_steal_another_agents_task():
+    async def scenario():
+        queue = _WorkStealingQueue(2, agent_workers={"a": [0], "b": [1]})
+        queue.put_nowait(task("a", 0))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.get(1), timeout=0.05)
+        return queue.get_nowait(0)
+    
+    assert run(scenario()) == task("a", 0)
+
+def test_unassigned_worker_steals_from_any_worker():
+    async def scenario():
+        queue = _WorkStealingQueue(2, agent_workers={"a": [0]})
+        queue.put_nowait(task("a", 0))
+        return await asyncio.wait_for(queue.get(1), timeout=1)
+    
+    assert run(scenario()) == task("a", 0)
+
+def test_put_wakes_a_waiting_worker():
+    async def scenario():
+        queue = _WorkStealingQueue(2, agent_workers={"a": [0, 1]})
+        getters = [asyncio.create_task(queue.get(worker)) for worker in range(2)]
+        await asyncio.sleep(0)
+        await queue.put(task("a", 0))
+        done, pending = await asyncio.wait(getters, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+        for getter in pending:
+            getter.cancel()
+        return [getter.result() for getter in done]
+    
+    assert run(scenario()) == [task("a", 0)]
+
+def test_put_waits_while_the_queue_is_full():
+    async def scenario():
+        queue = _WorkStealingQueue(1, maxsize=2, agent_workers={"a": [0]})
+        await queue.put(task("a", 0))
+        await queue.put(task("a", 1))
+        assert queue.full()
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(task("a", 2))
+        
+        putter = asyncio.create_task(queue.put(task("a", 2)))
+        await asyncio.sleep(0.01)
+        assert not putter.done()
+        
+        queue.get_nowait(0)
+        await asyncio.wait_for(putter, timeout=1)
+        return [t["n"] for t in queue.local_queues[0]]
+    
+    assert run(scenario()) == [1, 2]
+
+def test_put_many_queues_the_whole_list_and_waits_while_full():
+    async def scenario():
+        queue = _WorkStealingQueue(1, maxsize=2, agent_workers={"a": [0]})
+        await queue.put_many([task("a", n) for n in range(3)])
+        assert queue.qsize() == 3
+        
+        putter = asyncio.create_task(queue.put_many([task("a", 3)]))
+        await asyncio.sleep(0.01)
+        assert not putter.done()
+        
+        queue.get_nowait(0)
+        queue.get_nowait(0)
+        await asyncio.wait_for(putter, timeout=1)
+        return [t["n"] for t in queue.local_queues[0]]
+    
+    assert run(scenario()) == [2, 3]
+
+def test_join_waits_for_task_done_of_every_task():
+    async def scenario():
+        queue = _WorkStealingQueue(1, agent_workers={"a": [0]})
+        await queue.join()
+        await queue.put_many([task("a", 0), task("a", 1)])
+        
+        joiner = asyncio.create_task(queue.join())
+        queue.get_nowait(0)
+        queue.get_nowait(0)
+        queue.task_done()
+        await asyncio.sleep(0.01)
+        assert not joiner.done()
+        
+        queue.task_done()
+        await asyncio.wait_for(joiner, timeout=1)
+        with pytest.raises(ValueError):
+            queue.task_done()
+    
+    run(scenario())